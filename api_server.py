@@ -0,0 +1,280 @@
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import urllib.parse
+from collections import OrderedDict
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+
+import numpy as np
+
+from build_leaderboard import SORT_KEYS, build_rows, load_tables, source_files
+from storage import PROFILE_COLUMNS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# JSON API over the scraped profile tables, plus the dashboard pages as static files.
+#   GET /api/meta                          table sizes and the data version
+#   GET /api/users?page=&per_page=&prefix=&sort=&order=&min_rating=
+#                                          one page of the merged per-user summary
+#   GET /api/top?n=10&by=rating            top-N users by a summary column
+#   GET /api/users/<username>              summary plus the Badges/Ratings/Ranks rows of one user
+#   GET /api/tables/<Table>?username=&prefix=&page=&per_page=
+#                                          raw rows of Users/Badges/Ratings/Ranks/Submissions
+# Everything else is served from the static directory (index.html, leaderboard.html, ...).
+
+MAX_PER_PAGE = 500
+GZIP_MIN_BYTES = 1024
+
+class ProfileData:
+    """Profile tables loaded once, with per-user row indexes and a sorted username list for prefix search."""
+
+    def __init__(self, source):
+        self.source = Path(source)
+        self.signature = self.current_signature()
+        self.version = hashlib.sha1(repr(self.signature).encode()).hexdigest()[:12]
+        tables = load_tables(self.source)
+        self.tables = {}
+        self.rows_by_user = {}
+        for name, df in tables.items():
+            df = df.astype(object).where(df.notna(), None)
+            df["Username"] = df["Username"].map(lambda u: u.strip() if isinstance(u, str) else u)
+            self.tables[name] = df
+            self.rows_by_user[name] = df.groupby("Username", sort=False).indices
+
+        self.summary = build_rows(tables)
+        self.summary["globalRank"] = self.summary["globalRank"].astype(object).where(self.summary["globalRank"].notna(), None)
+        self.summary_by_user = {name: i for i, name in enumerate(self.summary["username"])}
+        order = np.argsort(self.summary["username"].str.lower().to_numpy(dtype=str), kind="stable")
+        self.prefix_order = order
+        self.sorted_names = self.summary["username"].str.lower().to_numpy(dtype=object)[order].tolist()
+        logging.info(f"Loaded {len(self.summary)} users from {self.source} (version {self.version})")
+
+    def current_signature(self):
+        return tuple((p.name, p.stat().st_size, p.stat().st_mtime_ns) for p in source_files(self.source))
+
+    def is_stale(self):
+        try:
+            return self.current_signature() != self.signature
+        except OSError:
+            return False  # mid-rewrite; keep serving the loaded copy
+
+    def prefix_rows(self, prefix):
+        """Summary rows whose username starts with `prefix` (case-insensitive), via binary search."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.sorted_names, prefix)
+        end = bisect.bisect_left(self.sorted_names, prefix + "\uffff")
+        return np.sort(self.prefix_order[start:end])
+
+    def table_rows(self, name, usernames=None):
+        df = self.tables[name]
+        if usernames is None:
+            return df
+        index = self.rows_by_user[name]
+        positions = [index[u] for u in usernames if u in index]
+        return df.iloc[np.concatenate(positions)] if positions else df.iloc[:0]
+
+class ResponseCache:
+    """Small thread-safe LRU of rendered responses, keyed by data version and request."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+def int_param(query, name, default, low=1, high=None):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    value = max(value, low)
+    return min(value, high) if high else value
+
+def paginate(df, query):
+    page = int_param(query, "page", 1)
+    per_page = int_param(query, "per_page", 50, high=MAX_PER_PAGE)
+    total = len(df)
+    items = df.iloc[(page - 1) * per_page:page * per_page].to_dict(orient="records")
+    return {"page": page, "per_page": per_page, "total": total, "pages": -(-total // per_page), "items": items}
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match test: "*" or any listed tag equal to `etag`, ignoring W/ (weak comparison)."""
+    etag = etag.removeprefix("W/")
+    for tag in (t.strip() for t in (if_none_match or "").split(",")):
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+class ApiService:
+    """Routes API requests to ProfileData and caches the encoded responses."""
+
+    def __init__(self, source, cache_size=256):
+        self.source = source
+        self.data = ProfileData(source)
+        self.cache = ResponseCache(cache_size)
+        self.reload_lock = threading.Lock()
+
+    def current_data(self):
+        if self.data.is_stale():
+            with self.reload_lock:
+                if self.data.is_stale():
+                    self.data = ProfileData(self.source)
+        return self.data
+
+    def handle(self, path, query):
+        """Returns (status, payload)."""
+        data = self.current_data()
+        parts = [urllib.parse.unquote(p) for p in path.split("/") if p][1:]  # drop "api"
+        if parts == ["meta"]:
+            return 200, {
+                "version": data.version,
+                "source": str(data.source),
+                "users": len(data.summary),
+                "tables": {name: len(df) for name, df in data.tables.items()},
+                "cache": {"hits": self.cache.hits, "misses": self.cache.misses, "entries": len(self.cache.entries)},
+            }
+        if parts == ["users"]:
+            df = data.summary
+            prefix = query.get("prefix", [""])[0]
+            if prefix:
+                df = df.iloc[data.prefix_rows(prefix)]
+            min_rating = int_param(query, "min_rating", 0, low=0)
+            if min_rating:
+                df = df[df["rating"] >= min_rating]
+            sort = query.get("sort", ["rating"])[0]
+            if sort not in SORT_KEYS and sort != "username":
+                raise ValueError(f"sort must be one of {SORT_KEYS + ['username']}")
+            ascending = query.get("order", ["asc" if sort in ("username", "globalRank") else "desc"])[0] == "asc"
+            df = df.sort_values(sort, ascending=ascending, kind="stable", na_position="last")
+            return 200, paginate(df, query)
+        if parts == ["top"]:
+            by = query.get("by", ["rating"])[0]
+            if by not in SORT_KEYS:
+                raise ValueError(f"by must be one of {SORT_KEYS}")
+            n = int_param(query, "n", 10, high=MAX_PER_PAGE)
+            ascending = by == "globalRank"
+            df = data.summary.sort_values(by, ascending=ascending, kind="stable", na_position="last").head(n)
+            return 200, {"by": by, "items": df.to_dict(orient="records")}
+        if len(parts) == 2 and parts[0] == "users":
+            row = data.summary_by_user.get(parts[1])
+            if row is None:
+                return 404, {"error": f"unknown user {parts[1]}"}
+            profile = data.summary.iloc[row].to_dict()
+            profile["tables"] = {
+                name: data.table_rows(name, [parts[1]]).drop(columns="Username").to_dict(orient="records")
+                for name in ("Badges", "Ratings", "Ranks")
+            }
+            profile["submission_count"] = len(data.rows_by_user["Submissions"].get(parts[1], []))
+            return 200, profile
+        if len(parts) == 2 and parts[0] == "tables":
+            if parts[1] not in PROFILE_COLUMNS:
+                return 404, {"error": f"unknown table {parts[1]}", "tables": list(PROFILE_COLUMNS)}
+            usernames = query.get("username")
+            prefix = query.get("prefix", [""])[0]
+            if prefix:
+                usernames = (usernames or []) + data.summary["username"].iloc[data.prefix_rows(prefix)].tolist()
+            return 200, paginate(data.table_rows(parts[1], usernames), query)
+        return 404, {"error": "not found"}
+
+    def response(self, path, query):
+        """Encoded (status, body, gzipped body, etag), cached per data version and request."""
+        key = (self.current_data().version, path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        entry = self.cache.get(key)
+        if entry is None:
+            try:
+                status, payload = self.handle(path, query)
+            except ValueError as e:
+                status, payload = 400, {"error": str(e)}
+            body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+            compressed = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+            etag = f'"{key[0]}-{hashlib.sha1(body).hexdigest()[:16]}"'
+            entry = (status, body, compressed, etag)
+            if status == 200 and path != "/api/meta":  # meta reports live cache counters
+                self.cache.put(key, entry)
+        return entry
+
+class ApiHandler(SimpleHTTPRequestHandler):
+    service = None
+
+    def log_message(self, format, *args):
+        logging.debug("api: " + format % args)
+
+    def do_GET(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        if not (parsed.path == "/api" or parsed.path.startswith("/api/")):
+            return super().do_GET()
+        status, body, compressed, etag = self.service.response(parsed.path, urllib.parse.parse_qs(parsed.query))
+        if status == 200 and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        if compressed is not None and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = compressed
+            encoding = "gzip"
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-cache")  # always revalidate; unchanged data costs a 304
+        self.send_header("Vary", "Accept-Encoding")
+        if status == 200:
+            self.send_header("ETag", etag)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def make_api_server(source, static_dir=".", host="127.0.0.1", port=0, cache_size=256):
+    handler = type("BoundApiHandler", (ApiHandler,), {"service": ApiService(source, cache_size)})
+    return ThreadingHTTPServer((host, port), partial(handler, directory=str(static_dir)))
+
+def start_api_server(source, static_dir=".", host="127.0.0.1", port=0, cache_size=256):
+    """Start the API in a background thread. Returns (server, base_url)."""
+    server = make_api_server(source, static_dir, host, port, cache_size)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the profile tables as a paginated JSON API next to the dashboard pages.")
+    parser.add_argument("source", nargs="?", default="codechefprofiles.xlsx", help="profile workbook or Parquet table directory")
+    parser.add_argument("--static-dir", default=".", help="directory with the dashboard HTML files")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--cache-size", type=int, default=256, help="responses kept in the LRU cache")
+    args = parser.parse_args()
+
+    server = make_api_server(args.source, args.static_dir, port=args.port, cache_size=args.cache_size)
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"✅ Serving {args.source} on {base_url}/api/users and the dashboards on {base_url}/index.html")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,258 +1,278 @@
-import requests
-from bs4 import BeautifulSoup
-import urllib.parse
-import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import time
 import logging
-import openpyxl
-from pathlib import Path
 import requests.exceptions
-import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rate_limiter import HostRateLimiter
+from checkpoint import CheckpointStore
+from http_cache import CachedSession, HttpCache
+from http_client import create_session
+from instrumentation import add_time, count, stage, start_run
+from profile_parser import get_parser
+from submission_crawler import SubmissionCrawler
+from listing_backends import HttpListingBackend, SeleniumListingBackend, get_usernames
+from build_leaderboard import build as build_dashboard_data
+from export_shards import export as export_profile_shards
+from storage import StreamingExcelWriter, profile_records, profile_tables, stream_to_excel, write_tables
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+BASE_URL = "https://www.codechef.com"
+
 def save_to_excel(users, badges_all, ratings_all, ranks_all, submissions_all, file_path):
+    # Streams through a write-only workbook; the arguments may be lists or generators of rows
     try:
-        workbook = openpyxl.Workbook()
-        
-        # Users sheet
-        ws_users = workbook.active
-        ws_users.title = "Users"
-        ws_users.append(["Username"])
-        for username in users:
-            ws_users.append([username])
-        
-        # Badges sheet
-        ws_badges = workbook.create_sheet("Badges")
-        ws_badges.append(["Username", "Title", "Description", "Image URL"])
-        for b in badges_all:
-            ws_badges.append(b)
-        
-        # Ratings sheet
-        ws_ratings = workbook.create_sheet("Ratings")
-        ws_ratings.append(["Username", "Rating", "Stars", "Highest"])
-        for r in ratings_all:
-            ws_ratings.append(r)
-        
-        # Ranks sheet
-        ws_ranks = workbook.create_sheet("Ranks")
-        ws_ranks.append(["Username", "Label", "Rank"])
-        for rk in ranks_all:
-            ws_ranks.append(rk)
-        
-        # Submissions sheet
-        ws_subs = workbook.create_sheet("Submissions")
-        ws_subs.append(["Username", "Time", "Problem", "Result", "Language", "Solution Link"])
-        for s in submissions_all:
-            ws_subs.append(s)
-        
-        # Save the file
-        file_path = Path(file_path)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        workbook.save(file_path)
-        logging.info(f"Saved data for {len(users)} users to {file_path}")
+        with stage("persist"):
+            stream_to_excel({
+                "Users": ([username] for username in users),
+                "Badges": badges_all,
+                "Ratings": ratings_all,
+                "Ranks": ranks_all,
+                "Submissions": submissions_all,
+            }, file_path)
+        logging.info(f"Saved profile data to {file_path}")
     except Exception as e:
         logging.error(f"Failed to save to Excel file {file_path}: {e}")
 
-def get_usernames_from_institution(institution, max_pages_limit=20, max_retries=3):
-    usernames = set()
-    institution_encoded = urllib.parse.quote(institution)
-    page = 1
+def save_to_parquet(users, badges_all, ratings_all, ranks_all, submissions_all, directory):
+    """Primary store: one Parquet file per table (Users, Badges, Ratings, Ranks, Submissions)."""
+    try:
+        with stage("persist"):
+            tables = profile_tables(users, badges_all, ratings_all, ranks_all, submissions_all, keep_records=True)
+            write_tables(tables, directory, fmt="parquet")
+        logging.info(f"Saved data for {len(users)} users to {directory}")
+    except Exception as e:
+        logging.error(f"Failed to save Parquet tables to {directory}: {e}")
 
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--log-level=3")
+def get_usernames_from_institution(institution, max_pages_limit=20, max_retries=3, backends=None, pool=None):
+    """Usernames on the institution's ratings listing.
 
-    driver = webdriver.Chrome(options=chrome_options)
+    Uses the JSON ratings API first and only starts headless Chrome (or leases one from
+    `pool`) when that fails; pass `backends` (see listing_backends) to override the order
+    or point at a stub server.
+    """
+    if backends is None:
+        backends = [HttpListingBackend(max_retries=max_retries), SeleniumListingBackend(max_retries=max_retries, pool=pool)]
+    with stage("listing"):
+        return get_usernames(institution, max_pages_limit, backends)
 
+def fetch_profile_page(handle, session, headers, limiter=None, base_url=BASE_URL):
+    """The profile page response, or None. Retries happen in the session (see http_client)."""
+    url = f"{base_url}/users/{handle}"
+    # Pages a CachedSession can serve from disk do not spend rate-limit tokens
+    cache = getattr(session, "cache", None)
+    if limiter and not (cache and cache.is_fresh(url)):
+        add_time("rate_limit_wait", limiter.acquire(url))
     try:
-        while page <= max_pages_limit:
-            url = (
-                f"https://www.codechef.com/ratings/all"
-                f"?filterBy=Institution%3D{institution_encoded}"
-                f"&itemsPerPage=50&order=asc&page={page}&sortBy=global_rank"
-            )
-            logging.info(f"Fetching page {page}: {url}")
-
-            for attempt in range(max_retries):
-                try:
-                    driver.get(url)
-                    wait = WebDriverWait(driver, 30)
-                    wait.until_not(EC.presence_of_element_located((By.CLASS_NAME, "loadingIcon")))
-                    time.sleep(2)
-                    break
-                except Exception as e:
-                    logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for page {page}: {e}")
-                    if attempt + 1 == max_retries:
-                        logging.error(f"Max retries reached for page {page}, skipping")
-                        return sorted(list(usernames))
-                    time.sleep(2 ** attempt + random.uniform(5.0, 8.0))
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            page_text = soup.get_text().lower()
-            if "no results" in page_text or "no users" in page_text or "0 results" in page_text:
-                logging.info(f"No results found on page {page}")
-                break
-
-            table = soup.find("table", class_=re.compile(r"MuiTable-root.*MUIDataTable-tableRoot")) or soup.find("table")
-            if not table:
-                logging.error(f"No table found on page {page}. Page title: {soup.title.get_text() if soup.title else 'No title'}")
-                break
-
-            rows = table.find_all("tr")
-            if len(rows) <= 1:
-                logging.warning(f"No data rows found on page {page}")
-                break
-
-            page_usernames = set()
-            for row in rows[1:]:
-                first_td = row.find("td", {"data-colindex": "0"})
-                if first_td:
-                    link = first_td.find("a", href=re.compile(r"/users/"))
-                    if link:
-                        username_span = link.find("span", class_="m-username--link")
-                        username = username_span.get_text(strip=True) if username_span else link.get("title", "")
-                        if username:
-                            page_usernames.add(username)
-
-            new_users = len(page_usernames - usernames)
-            usernames.update(page_usernames)
-            logging.info(f"Extracted {len(page_usernames)} users from page {page} ({new_users} new). Total so far: {len(usernames)}")
-
-            if new_users == 0:
-                logging.info(f"No new users on page {page}, stopping")
-                break
-            if len(page_usernames) < 50 and page > 1:
-                logging.info(f"Partial page {page} ({len(page_usernames)} users < 50), likely last page")
-                break
-
-            next_button = soup.find("button", {"aria-label": re.compile(r"Go to next page", re.I)}) or \
-                          soup.find("button", string=re.compile(r"Next", re.I)) or \
-                          soup.find("button", class_=re.compile(r"MuiPaginationItem.*next"))
-            if not next_button or ("disabled" in next_button.get("class", []) or next_button.get("disabled") or "false" in next_button.get("aria-disabled", "")):
-                logging.info("Next button disabled or not found - no more pages")
-                break
-
-            page += 1
-            time.sleep(random.uniform(5.0, 8.0))
+        with stage("fetch"):
+            response = session.get(url, headers=headers, timeout=10)
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Request failed for profile {handle}, skipping: {e}")
+        return None
+    if response.status_code != 200:
+        logging.error(f"Request failed for profile {handle}, skipping: Status {response.status_code}")
+        return None
+    return response
 
-    except Exception as e:
-        logging.error(f"Error during extraction: {e}")
-    finally:
-        driver.quit()
+def fetch_submissions_page(handle, session, headers, limiter=None, base_url=BASE_URL):
+    """The first recent-submissions page response, or None. Retries happen in the session."""
+    api_url = f"{base_url}/recent/user?user_handle={handle}&page=0"
+    if limiter:
+        add_time("rate_limit_wait", limiter.acquire(api_url))
+    try:
+        with stage("fetch"):
+            resp = session.get(api_url, headers=headers, timeout=10)
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Request failed for submissions {handle}, skipping: {e}")
+        return None
+    if resp.status_code != 200:
+        logging.error(f"Request failed for submissions {handle}, skipping: Status {resp.status_code}")
+        return None
+    return resp
+
+def recent_submissions(handle, session, headers, limiter=None, base_url=BASE_URL, parser=None):
+    """Rows of the first recent-submissions page, or None if it could not be fetched."""
+    resp = fetch_submissions_page(handle, session, headers, limiter, base_url)
+    if resp is None:
+        return None
+    try:
+        with stage("parse"):
+            data = resp.json()
+            return (parser or get_parser()).parse_submissions(data.get("content", ""), handle)
+    except ValueError as e:
+        logging.warning(f"Failed to parse JSON for submissions of {handle}: {e}")
+        return None
+
+class ProfileResult(tuple):
+    """(badges, ratings, ranks, submissions); `partial` is set when the submissions could not be fetched."""
 
-    return sorted(list(usernames))
+    def __new__(cls, badges, ratings, ranks, submissions, partial=False):
+        result = super().__new__(cls, (badges, ratings, ranks, submissions))
+        result.partial = partial
+        return result
 
-def scrape_user_profile(handle, session, headers, max_retries=3):
+def scrape_user_profile(handle, session, headers, limiter=None, executor=None, base_url=BASE_URL,
+                        parser=None, crawler=None, history=None):
+    """Badges, ratings, ranks and submissions of one user.
+
+    With a SubmissionCrawler the whole submission history is fetched, extending `history`
+    (the rows stored by an earlier run); otherwise only the first page of recent submissions.
+    Returns a ProfileResult, marked partial when the submissions fetch failed.
+    """
+    parser = parser or get_parser()
     badges_data = []
     ratings_data = []
     ranks_data = []
-    submissions_data = []
+
+    if crawler:
+        fetch_submissions = lambda: crawler.crawl(handle, history)
+    else:
+        fetch_submissions = lambda: recent_submissions(handle, session, headers, limiter, base_url, parser)
+
+    # The submissions API does not depend on the profile page, so with an executor both are fetched at once
+    sub_future = executor.submit(fetch_submissions) if executor else None
 
     # Scrape profile page
-    url = f"https://www.codechef.com/users/{handle}"
-    for attempt in range(max_retries):
-        try:
-            response = session.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                break
-            logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for profile {handle}: Status {response.status_code}")
-            if attempt + 1 == max_retries:
-                logging.error(f"Max retries reached for profile {handle}, skipping")
-                return badges_data, ratings_data, ranks_data, submissions_data
-            time.sleep(2 ** attempt + random.uniform(5.0, 8.0))
-        except requests.exceptions.RequestException as e:
-            logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for profile {handle}: {e}")
-            if attempt + 1 == max_retries:
-                logging.error(f"Max retries reached for profile {handle}, skipping")
-                return badges_data, ratings_data, ranks_data, submissions_data
-            time.sleep(2 ** attempt + random.uniform(5.0, 8.0))
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    # Badges
-    badge_section = soup.find_all('div', class_='widget badges')
-    for section in badge_section:
-        badges = section.find_all('div', class_='badge')
-        for badge in badges:
-            title = badge.find('p', class_='badge__title').text.strip() if badge.find('p', class_='badge__title') else "N/A"
-            description = badge.find('p', class_='badge__description').text.strip() if badge.find('p', class_='badge__description') else "N/A"
-            image_url = badge.find('img')['src'] if badge.find('img') and 'src' in badge.find('img').attrs else "N/A"
-            badges_data.append([handle, title, description, image_url])
-
-    # Rating & Stars & Highest
-    rating_section = soup.find('div', class_='rating-header text-center')
-    rating, star, highest = "N/A", "N/A", "N/A"
-    if rating_section:
-        rating_elem = rating_section.find('div', class_='rating-number')
-        star_elem = rating_section.find('span')
-        highest_elem = rating_section.find('small')
-        rating = rating_elem.text.strip() if rating_elem else "N/A"
-        star = star_elem.text.strip() if star_elem else "N/A"
-        highest = highest_elem.text.strip() if highest_elem else "N/A"
-    ratings_data = [handle, rating, star, highest]
-
-    # Ranks
-    ranks_section = soup.find('div', class_='rating-ranks')
-    if ranks_section:
-        list_items = ranks_section.find_all('li')
-        for item in list_items:
-            rank = item.find('strong').text.strip() if item.find('strong') else "N/A"
-            label = item.get_text(strip=True).replace(rank, "").strip()
-            ranks_data.append([handle, label, rank])
-
-    # Recent Submissions (via API)
-    api_url = f"https://www.codechef.com/recent/user?user_handle={handle}&page=0"
-    for attempt in range(max_retries):
-        try:
-            resp = session.get(api_url, headers=headers, timeout=10)
-            if resp.status_code == 200:
-                break
-            logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for submissions {handle}: Status {resp.status_code}")
-            if attempt + 1 == max_retries:
-                logging.error(f"Max retries reached for submissions {handle}, skipping")
-                return badges_data, ratings_data, ranks_data, submissions_data
-            time.sleep(2 ** attempt + random.uniform(5.0, 8.0))
-        except requests.exceptions.RequestException as e:
-            logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for submissions {handle}: {e}")
-            if attempt + 1 == max_retries:
-                logging.error(f"Max retries reached for submissions {handle}, skipping")
-                return badges_data, ratings_data, ranks_data, submissions_data
+    response = fetch_profile_page(handle, session, headers, limiter, base_url)
+    if response is None:
+        if sub_future:
+            sub_future.cancel()
+        return ProfileResult(badges_data, ratings_data, ranks_data, [])
+
+    # Through a CachedSession, a byte-identical page reuses the rows parsed last time
+    cache = getattr(session, "cache", None)
+    with stage("parse"):
+        if cache and getattr(response, "content_hash", None):
+            badges_data, ratings_data, ranks_data = cache.parsed(response.content_hash, lambda: parser.parse_profile(response.text, handle))
+        else:
+            badges_data, ratings_data, ranks_data = parser.parse_profile(response.text, handle)
+
+    # Recent Submissions (via API); on failure keep whatever history was already stored
+    submissions_data = sub_future.result() if sub_future else fetch_submissions()
+    if submissions_data is None:
+        return ProfileResult(badges_data, ratings_data, ranks_data, list(history or []), partial=True)
+
+    return ProfileResult(badges_data, ratings_data, ranks_data, submissions_data)
 
+def iter_profiles(users, session, headers, workers=4, requests_per_second=1.0, burst=None, base_url=BASE_URL, checkpoint=None, max_age_hours=24, full_history=False, max_submission_pages=None):
+    """Yield (handle, (badges, ratings, ranks, submissions)) as each profile finishes.
+
+    `workers` threads share one per-host token bucket; pass a session from
+    http_client.create_session(workers) so they also share its connection pool and
+    retry failed requests. With a CheckpointStore, each
+    successful profile is committed as soon as it finishes and handles scraped within
+    `max_age_hours` are yielded from the store first instead of being re-fetched.
+    With `full_history` every submission page is crawled (see SubmissionCrawler); stored
+    submissions are extended rather than fetched again.
+    """
+    limiter = HostRateLimiter(requests_per_second, burst)
+    pending = list(users)
+    if checkpoint:
+        fresh = checkpoint.fresh_handles(users, max_age_hours * 3600)
+        logging.info(f"Resuming: {len(fresh)} of {len(users)} handles are fresh in {checkpoint.path}")
+        for handle in users:
+            if handle in fresh:
+                yield handle, checkpoint.load(handle)
+        pending = [handle for handle in users if handle not in fresh]
+
+    crawler = None
+    if full_history:
+        crawler = SubmissionCrawler(session, headers, limiter, base_url, workers, max_pages=max_submission_pages)
     try:
-        data = resp.json()
-        html_content = data.get("content", "")
-        soup_sub = BeautifulSoup(html_content, "html.parser")
-        rows = soup_sub.find_all("tr")
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) == 5:
-                time_val = cols[0].text.strip()
-                problem = cols[1].text.strip()
-                result = cols[2].text.strip()
-                language = cols[3].text.strip()
-                link_tag = cols[4].find("a")
-                solution_link = f"https://www.codechef.com{link_tag['href']}" if link_tag and link_tag.has_attr("href") else "N/A"
-                submissions_data.append([handle, time_val, problem, result, language, solution_link])
-    except ValueError as e:
-        logging.warning(f"Failed to parse JSON for submissions of {handle}: {e}")
+        with ThreadPoolExecutor(max_workers=workers) as fetch_pool, ThreadPoolExecutor(max_workers=workers) as handle_pool:
+            def scrape(handle):
+                # Loaded in the worker, so only the running jobs' stored histories are in memory
+                stored = checkpoint.load(handle) if checkpoint and crawler else None
+                return scrape_user_profile(handle, session, headers, limiter, fetch_pool, base_url,
+                                           crawler=crawler, history=stored[3] if stored else None)
 
-    return badges_data, ratings_data, ranks_data, submissions_data
+            futures = {handle_pool.submit(scrape, handle): handle for handle in pending}
+            total = len(futures)
+            for done, future in enumerate(as_completed(futures), start=1):
+                handle = futures.pop(future)  # drop the finished future, and its rows once consumed
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.error(f"Unexpected error scraping {handle}: {e}")
+                    result = ([], [], [], [])
+                count("profiles" if result[1] else "profiles_failed")
+                count("rows", sum(len(table) for table in (result[0], result[2], result[3])) + bool(result[1]))
+                # An empty ratings entry means the profile page itself failed; leave it for the next run.
+                # Without its submissions the profile is stored but not fresh, so it is fetched again.
+                if checkpoint and result[1]:
+                    with stage("persist"):
+                        checkpoint.save(handle, result, partial=getattr(result, "partial", False))
+                logging.info(f"Scraped profile for {handle} ({done}/{total})")
+                yield handle, result
+    finally:
+        if crawler:
+            crawler.close()
+
+def scrape_profiles(users, session, headers, **kwargs):
+    """Scrape every handle concurrently (see iter_profiles for the options).
+
+    Returns (badges_all, ratings_all, ranks_all, submissions_all) in the order of `users`,
+    exactly as the sequential loop used to build them for save_to_excel (see collect_profiles).
+    """
+    return collect_profiles(users, iter_profiles(users, session, headers, **kwargs))
+
+def collect_profiles(users, profiles):
+    """Merge (handle, result) pairs, in any order, into four RecordTables ordered like `users`.
+
+    Each profile is encoded into the tables as soon as it arrives and its row lists are
+    dropped, so the raw rows of all users are never held at once. Iterating a table gives
+    the row lists; the repeating strings are stored once (see storage.DICTIONARY_COLUMNS).
+    """
+    records = profile_records()
+    tables = [records["Badges"], records["Ratings"], records["Ranks"], records["Submissions"]]
+    spans = {}  # handle -> (start, end) of its rows in each table
+    for handle, (badges, ratings, ranks, subs) in profiles:
+        starts = [len(table) for table in tables]
+        tables[0].extend(badges)
+        if ratings and ratings[1] != "N/A":
+            tables[1].append(ratings)
+        tables[2].extend(ranks)
+        tables[3].extend(subs)
+        spans[handle] = list(zip(starts, (len(table) for table in tables)))
+
+    # Profiles finish in any order; put the rows back in the order of `users`
+    ordered = []
+    for i, table in enumerate(tables):
+        positions = [row for handle in users if handle in spans for row in range(*spans[handle][i])]
+        ordered.append(table.take(positions))
+    return tuple(ordered)
+
+def scrape_to_excel(users, session, headers, file_path, **kwargs):
+    """Stream each finished profile straight into a write-only workbook without keeping the rows."""
+    with StreamingExcelWriter(file_path) as writer:
+        for handle, (badges, ratings, ranks, subs) in iter_profiles(users, session, headers, **kwargs):
+            with stage("persist"):
+                writer.append("Users", [handle])
+                writer.extend("Badges", badges)
+                if ratings and ratings[1] != "N/A":
+                    writer.append("Ratings", ratings)
+                writer.extend("Ranks", ranks)
+                writer.extend("Submissions", subs)
+    logging.info(f"Saved data for {len(users)} users to {file_path}")
 
 # ------------------ MAIN ------------------ #
 if __name__ == "__main__":
     institution = "Sri Eshwar College of Engineering, Kinathukadavu"
-    output_file = r"C:\AllOther\Python\CodeChef\codechefprofiles.xlsx"
+    output_dir = r"C:\AllOther\Python\CodeChef\codechefprofiles"  # Parquet tables
+    output_file = r"C:\AllOther\Python\CodeChef\codechefprofiles.xlsx"  # workbook for the dashboards
+    write_excel = True
+    dashboard_dir = r"C:\AllOther\Python\CodeChef\dashboard_data"  # JSON for leaderboard.html / compare.html
+    shards_dir = r"C:\AllOther\Python\CodeChef\profile_shards"  # gzip JSON shards for index.html / userdata.html
+    stream_excel = False  # very large institutions: stream rows straight into the workbook, skip Parquet
+    workers = 4  # concurrent profile scrapers
+    requests_per_second = 0.5  # shared budget for all workers against codechef.com
+    max_retries = 3  # attempts per request; 429/5xx and connection errors are retried with backoff
+    checkpoint_file = r"C:\AllOther\Python\CodeChef\scrape_checkpoint.sqlite3"
+    freshness_hours = 24  # handles scraped more recently than this are not fetched again
+    http_cache_file = r"C:\AllOther\Python\CodeChef\http_cache.sqlite3"
+    http_cache_hours = 6  # profile pages younger than this are not requested; older ones are revalidated
+    full_history = True  # crawl every submission page; later runs only fetch pages newer than the checkpoint
+    report_file = r"C:\AllOther\Python\CodeChef\scrape_report.json"  # per-stage timings and counters of this run
+    metrics_file = None  # e.g. a node_exporter textfile path, for Prometheus-format metrics
     headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36'}
     
     # Optional: Proxy support (uncomment and configure if needed)
@@ -261,8 +281,11 @@ if __name__ == "__main__":
     #     'https': 'https://your_proxy:port'
     # }
     
-    session = requests.Session()
+    run = start_run("profiles")
+    session = create_session(workers, max_retries)
     # session.proxies = proxies  # Uncomment if using proxies
+    http_cache = HttpCache(http_cache_file, ttl_seconds=http_cache_hours * 3600)
+    session = CachedSession(session, http_cache)
 
     users = get_usernames_from_institution(institution)
     
@@ -274,19 +297,26 @@ if __name__ == "__main__":
         print(f"✅ Found {len(users)} users from {institution}")
         print(users)
         
-        badges_all = []
-        ratings_all = []
-        ranks_all = []
-        submissions_all = []
-        
-        for handle in users:
-            logging.info(f"Scraping profile for {handle}")
-            badges, ratings, ranks, subs = scrape_user_profile(handle, session, headers)
-            badges_all.extend(badges)
-            if ratings and ratings[1] != "N/A":
-                ratings_all.append(ratings)
-            ranks_all.extend(ranks)
-            submissions_all.extend(subs)
-            time.sleep(random.uniform(5.0, 8.0))  # Increased random delay to avoid rate-limiting
-            
-        save_to_excel(users, badges_all, ratings_all, ranks_all, submissions_all, output_file)
\ No newline at end of file
+        with CheckpointStore(checkpoint_file) as checkpoint:
+            options = dict(workers=workers, requests_per_second=requests_per_second,
+                           checkpoint=checkpoint, max_age_hours=freshness_hours, full_history=full_history)
+            if stream_excel:
+                scrape_to_excel(users, session, headers, output_file, **options)
+            else:
+                badges_all, ratings_all, ranks_all, submissions_all = scrape_profiles(users, session, headers, **options)
+
+        if not stream_excel:
+            save_to_parquet(users, badges_all, ratings_all, ranks_all, submissions_all, output_dir)
+            if write_excel:
+                save_to_excel(users, badges_all, ratings_all, ranks_all, submissions_all, output_file)
+        # No-op when the scraped tables did not change since the last build
+        with stage("persist"):
+            build_dashboard_data(output_file if stream_excel else output_dir, dashboard_dir)
+            export_profile_shards(output_file if stream_excel else output_dir, shards_dir)
+    print(f"✅ {http_cache.summary()}")
+    print(f"✅ {session.stats.summary()}")
+    http_cache.close()
+    run.write_report(report_file)
+    if metrics_file:
+        run.write_prometheus(metrics_file)
+    print(f"✅ {run.summary()}")
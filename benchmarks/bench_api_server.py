@@ -0,0 +1,58 @@
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import requests
+from api_server import start_api_server
+from storage import profile_tables, stream_to_excel, write_tables
+
+# A synthetic 5,000-user institution: bytes and latency of one dashboard view through
+# the API (first request, cached request, 304 revalidation) vs downloading the whole
+# workbook as the static pages do. Run: python benchmarks/bench_api_server.py
+
+USERS = 5_000
+SUBMISSIONS_PER_USER = 12
+
+def synthetic_tables(n):
+    users = [f"user_{i:05d}" for i in range(n)]
+    badges = [[u, "Contest Contender - Bronze Badge", "Received for participating in 5 Contests", ""] for u in users]
+    ratings = [[u, str(1000 + i % 900), "★", f"(Highest Rating {1100 + i % 900})"] for i, u in enumerate(users)]
+    ranks = [row for i, u in enumerate(users) for row in ([u, "Global Rank", str(10000 + i)], [u, "Country Rank", str(5000 + i)])]
+    subs = [[u, "08:32 PM 11/12/24", f"PROB{j:03d}", "(100)", "C++", f"https://www.codechef.com/viewsolution/{i * 100 + j}"]
+            for i, u in enumerate(users) for j in range(SUBMISSIONS_PER_USER)]
+    return users, badges, ratings, ranks, subs
+
+def timed_get(url, **kwargs):
+    start = time.perf_counter()
+    response = requests.get(url, **kwargs)
+    return response, (time.perf_counter() - start) * 1000
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        users, badges, ratings, ranks, subs = synthetic_tables(USERS)
+        data_dir = Path(tmp) / "codechefprofiles"
+        write_tables(profile_tables(users, badges, ratings, ranks, subs), data_dir)
+        workbook = Path(tmp) / "codechefprofiles.xlsx"
+        stream_to_excel({"Users": ([u] for u in users), "Badges": badges, "Ratings": ratings,
+                         "Ranks": ranks, "Submissions": subs}, workbook)
+
+        start = time.perf_counter()
+        server, base_url = start_api_server(data_dir, static_dir=tmp)
+        print(f"API startup (load + index {USERS} users): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        _, ms = timed_get(f"{base_url}/codechefprofiles.xlsx")
+        print(f"{'static workbook':<28}{workbook.stat().st_size / 1024:>10.1f} KB{ms:>10.1f} ms")
+        view = f"{base_url}/api/users?page=3&per_page=50&sort=rating"
+        first, ms = timed_get(view, headers={"Accept-Encoding": "gzip"})
+        print(f"{'API page (first)':<28}{int(first.headers['Content-Length']) / 1024:>10.1f} KB{ms:>10.1f} ms")
+        again, ms = timed_get(view, headers={"Accept-Encoding": "gzip"})
+        print(f"{'API page (LRU hit)':<28}{int(again.headers['Content-Length']) / 1024:>10.1f} KB{ms:>10.1f} ms")
+        cached, ms = timed_get(view, headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+        print(f"{'API page (304)':<28}{0:>10.1f} KB{ms:>10.1f} ms  status {cached.status_code}")
+        _, ms = timed_get(f"{base_url}/api/users?prefix=user_012&per_page=20")
+        print(f"{'API prefix search':<28}{'':>13}{ms:>10.1f} ms")
+        server.shutdown()
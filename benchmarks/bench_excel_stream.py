@@ -0,0 +1,56 @@
+import sys
+import time
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import openpyxl
+from storage import stream_to_excel
+
+# Peak RSS of exporting N submission rows with the streaming writer vs a normal
+# in-memory openpyxl workbook (the old save_to_excel). Rows come from a generator, so
+# the streaming case never materialises them. Run: python benchmarks/bench_excel_stream.py
+
+SIZES = [1_000, 10_000, 100_000]
+
+def submission_rows(n):
+    for i in range(n):
+        yield [f"user_{i % 2000:05d}", "08:32 PM 11/12/24", f"PROB{i % 3000:04d}", "Accepted", "C++",
+               f"https://www.codechef.com/viewsolution/{1100000000 + i}"]
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def run_case(mode, n, queue):
+    baseline = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "profiles.xlsx"
+        start = time.perf_counter()
+        if mode == "streaming":
+            stream_to_excel({"Submissions": submission_rows(n)}, path)
+        else:
+            workbook = openpyxl.Workbook()
+            sheet = workbook.active
+            sheet.title = "Submissions"
+            sheet.append(["Username", "Time", "Problem", "Result", "Language", "Solution Link"])
+            for row in submission_rows(n):
+                sheet.append(row)
+            workbook.save(path)
+        elapsed = time.perf_counter() - start
+    queue.put((elapsed, peak_rss_mb() - baseline))
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{'mode':<12}{'rows':>10}{'seconds':>10}{'peak MB':>10}")
+    for mode in ("in-memory", "streaming"):
+        for n in SIZES:
+            queue = multiprocessing.Queue()
+            proc = multiprocessing.Process(target=run_case, args=(mode, n, queue))
+            proc.start()
+            elapsed, peak_mb = queue.get()
+            proc.join()
+            print(f"{mode:<12}{n:>10}{elapsed:>10.2f}{peak_mb:>10.1f}")
@@ -0,0 +1,139 @@
+import re
+import sys
+import time
+import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import numpy as np
+import pandas as pd
+from features import build_features
+from timeparse import parse_last_ac, parse_last_ac_column
+
+# Parity check and timings for the vectorized feature engine against the original
+# row-wise load_and_preprocess body (kept below as the reference, with its scalar helpers).
+# Run: python benchmarks/bench_features.py [--full]   (--full also times the reference at 1M rows)
+
+SIZES = [10_000, 100_000, 1_000_000]
+REFERENCE_LIMIT = 100_000
+
+def safe_extract_number(s):
+    """Extract numeric part of a string safely."""
+    if pd.isnull(s): return np.nan
+    s = str(s)
+    m = re.search(r"[-+]?\d+(\.\d+)?", s)
+    return float(m.group(0)) if m else np.nan
+
+def parse_last_ac_to_days(s):
+    """Convert 'Last AC' text into days (see timeparse for the accepted formats)."""
+    return parse_last_ac(s)
+
+def reference_features(df):
+    """The pre-vectorization load_and_preprocess, minus the file I/O (Last AC via the scalar parser)."""
+    df = df.copy()
+    df.columns = [c.strip() for c in df.columns]
+    problem_cols = [c for c in df.columns if re.match(r"^P\d+$", c.strip(), re.I)]
+    if not problem_cols:
+        problem_cols = [c for c in df.columns if "P" in c and any(ch.isdigit() for ch in c)]
+    for pc in problem_cols:
+        df[pc + "_score"] = df[pc].fillna("-").map(lambda x: safe_extract_number(x) if str(x).strip() != "-" else 0.0)
+
+    def parse_rank(x):
+        if pd.isnull(x): return np.nan
+        m = re.search(r"\d+", str(x))
+        return int(m.group(0)) if m else np.nan
+
+    rank_col = next((c for c in df.columns if "rank" in c.lower()), None)
+    df["Rank_num"] = df[rank_col].map(parse_rank) if rank_col else np.arange(1, len(df) + 1)
+    total_col = next((c for c in df.columns if "total" in c.lower() and "score" in c.lower()), None)
+    if total_col:
+        df["TotalScore_num"] = df[total_col].map(safe_extract_number)
+    else:
+        df["TotalScore_num"] = df[[pc + "_score" for pc in problem_cols]].sum(axis=1)
+    if "Problems Solved" in df.columns:
+        df["Problems Solved"] = df["Problems Solved"].fillna(0).astype(int)
+    else:
+        df["Problems Solved"] = df[[pc + "_score" for pc in problem_cols]].apply(lambda r: (r > 0).sum(), axis=1)
+    last_ac_col = next((c for c in df.columns if "last" in c.lower() and "ac" in c.lower()), None)
+    df["LastAC_days"] = df[last_ac_col].map(parse_last_ac_to_days) if last_ac_col else -1
+    score_cols = [pc + "_score" for pc in problem_cols]
+    df["num_attempted"] = df[score_cols].apply(lambda r: int((r > 0).sum()), axis=1)
+    df["avg_problem_score"] = df[score_cols].mean(axis=1)
+    df["max_problem_score"] = df[score_cols].max(axis=1)
+    df["std_problem_score"] = df[score_cols].std(axis=1).fillna(0)
+    return df.fillna(-1), problem_cols
+
+def legacy_parse_last_ac_to_days(s):
+    """The original exception-driven strptime loop, kept to measure the Last AC parser."""
+    if pd.isnull(s) or str(s).strip() in ["N/A", "-"]: return -1
+    s = str(s)
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%b %d, %Y", "%d %b %Y"):
+        try:
+            dt = datetime.datetime.strptime(s, fmt)
+            return (datetime.datetime.now() - dt).days
+        except: pass
+    if "day" in s:
+        m = re.search(r"(\d+)\s+day", s)
+        if m: return int(m.group(1))
+    if "hour" in s: return 0
+    return -1
+
+def synthetic_rankings(n, seed=0):
+    """Contest ranking rows shaped like codechef_<code>_contest_data.xlsx."""
+    rng = np.random.default_rng(seed)
+    scores = np.array(["100", "-", "50", "0", "-", "100", "25"], dtype=object)
+    last_ac = np.array(["1:07:45", "0:13:28", "-", "2 days ago", "3 hours ago", "2024-11-12", "N/A", None], dtype=object)
+    df = pd.DataFrame({
+        "Username": [f"user_{i}" for i in range(n)],
+        "Rank": rng.integers(1, 50_000, n),
+        "Total Score": rng.choice(np.array(["Total Score", "400", "250.5", None], dtype=object), n),
+        "Last AC": rng.choice(last_ac, n),
+    })
+    for i in range(1, 9):
+        df[f"P{i}"] = rng.choice(scores, n)
+    df["Problems Solved"] = (df[[f"P{i}" for i in range(1, 9)]].isin(["100", "50", "25"])).sum(axis=1)
+    return df
+
+def check_parity(n=10_000):
+    df = synthetic_rankings(n)
+    df.loc[df.sample(frac=0.1, random_state=1).index, "Rank"] = None
+    for frame in (df, df.drop(columns=["Problems Solved", "Total Score"])):
+        expected, expected_cols = reference_features(frame)
+        actual, actual_cols = build_features(frame)
+        assert expected_cols == actual_cols
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    real = Path(__file__).resolve().parent.parent / "codechef_START202D_contest_data.xlsx"
+    if real.exists():
+        frame = pd.read_excel(real, engine="openpyxl")
+        pd.testing.assert_frame_equal(build_features(frame)[0], reference_features(frame)[0], check_dtype=False)
+    print(f"✅ Parity with the row-wise implementation on {n} synthetic rows (+ the START202D export)")
+
+if __name__ == "__main__":
+    full = "--full" in sys.argv
+    check_parity()
+    print(f"{'rows':>10}{'reference s':>14}{'vectorized s':>14}{'speedup':>10}")
+    for n in SIZES:
+        df = synthetic_rankings(n)
+        start = time.perf_counter()
+        build_features(df)
+        fast = time.perf_counter() - start
+        if n <= REFERENCE_LIMIT or full:
+            start = time.perf_counter()
+            reference_features(df)
+            slow = time.perf_counter() - start
+            print(f"{n:>10}{slow:>14.2f}{fast:>14.2f}{slow / fast:>9.1f}x")
+        else:
+            print(f"{n:>10}{'-':>14}{fast:>14.2f}{'-':>10}")
+
+    print(f"\nLast AC column only (distinct H:MM:SS values, the contest-export worst case)")
+    print(f"{'rows':>10}{'strptime loop s':>18}{'timeparse s':>14}")
+    for n in SIZES[:2]:
+        rng = np.random.default_rng(1)
+        column = pd.Series([f"{h}:{m:02d}:{s:02d}" for h, m, s in zip(rng.integers(0, 3, n), rng.integers(0, 60, n), rng.integers(0, 60, n))])
+        start = time.perf_counter()
+        column.map(legacy_parse_last_ac_to_days)
+        slow = time.perf_counter() - start
+        start = time.perf_counter()
+        parse_last_ac_column(column)
+        fast = time.perf_counter() - start
+        print(f"{n:>10}{slow:>18.2f}{fast:>14.3f}")
@@ -0,0 +1,47 @@
+import sys
+import time
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import requests
+from stub_server import start_stub_server, load_ratings_page, render_ratings_html, FIXTURES_DIR
+from listing_backends import HttpListingBackend, SeleniumListingBackend, parse_ratings_page
+
+# Replays the recorded ratings listing (fixtures/ratings) from a local stub server and
+# compares the JSON backend against the Selenium path. Run: python benchmarks/bench_listing.py
+
+INSTITUTION = "Sri Eshwar College of Engineering, Kinathukadavu"
+ROUNDS = 20
+
+def timed(fn, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds, result
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    server, base_url = start_stub_server(delay=0.05)  # ~50 ms simulated latency per request
+    try:
+        http_backend = HttpListingBackend(session=requests.Session(), base_url=base_url, workers=4)
+        http_time, http_users = timed(lambda: http_backend.get_usernames(INSTITUTION))
+        print(f"HTTP/JSON backend : {http_time * 1000:8.1f} ms per listing ({len(http_users)} users)")
+
+        pages = []
+        page = 1
+        while (payload := load_ratings_page(FIXTURES_DIR, page)) is not None:
+            pages.append(render_ratings_html(payload))
+            page += 1
+        parse_time, _ = timed(lambda: [parse_ratings_page(html) for html in pages])
+        print(f"Selenium parse    : {parse_time * 1000:8.1f} ms per listing (BeautifulSoup only, excludes browser + 2 s/page waits)")
+
+        try:
+            selenium_backend = SeleniumListingBackend(base_url=base_url)
+            selenium_time, selenium_users = timed(lambda: selenium_backend.get_usernames(INSTITUTION), rounds=1)
+            print(f"Selenium backend  : {selenium_time * 1000:8.1f} ms per listing ({len(selenium_users)} users)")
+            assert selenium_users == http_users, "backends disagree on the username set"
+        except Exception as e:
+            print(f"Selenium backend  : skipped ({type(e).__name__}: {e})")
+    finally:
+        server.shutdown()
@@ -0,0 +1,93 @@
+import sys
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from bs4 import BeautifulSoup
+from profile_parser import LxmlProfileParser, SoupProfileParser
+
+# Per-page parse time and peak Python allocations (tracemalloc) of the profile page + submissions HTML, for the
+# parsing code scrape_user_profile used to inline (html.parser over the whole page,
+# repeated finds) and the parsers in profile_parser.py. Live profile pages are ~250 KB of
+# navigation, scripts and widgets around the three that are read, so besides the bare
+# fixture the page is also measured padded to that size.
+# Run: python benchmarks/bench_profile_parser.py
+
+FIXTURES = ROOT / "fixtures"
+PADDING_BLOCK = (
+    '<div class="content-widget"><ul class="menu">' + '<li><a href="/practice">Practice</a></li>' * 20 + '</ul>'
+    '<script>window.__data = {"items": [' + ",".join(['{"id": 1, "name": "x"}'] * 20) + ']};</script>'
+    '<p class="text">' + "Lorem ipsum dolor sit amet. " * 20 + "</p></div>"
+)
+
+def legacy_parse(html, sub_html, handle):
+    """The parsing code formerly inline in app.scrape_user_profile."""
+    badges_data, ranks_data, submissions_data = [], [], []
+    soup = BeautifulSoup(html, 'html.parser')
+    for section in soup.find_all('div', class_='widget badges'):
+        for badge in section.find_all('div', class_='badge'):
+            title = badge.find('p', class_='badge__title').text.strip() if badge.find('p', class_='badge__title') else "N/A"
+            description = badge.find('p', class_='badge__description').text.strip() if badge.find('p', class_='badge__description') else "N/A"
+            image_url = badge.find('img')['src'] if badge.find('img') and 'src' in badge.find('img').attrs else "N/A"
+            badges_data.append([handle, title, description, image_url])
+    rating_section = soup.find('div', class_='rating-header text-center')
+    rating, star, highest = "N/A", "N/A", "N/A"
+    if rating_section:
+        rating_elem = rating_section.find('div', class_='rating-number')
+        star_elem = rating_section.find('span')
+        highest_elem = rating_section.find('small')
+        rating = rating_elem.text.strip() if rating_elem else "N/A"
+        star = star_elem.text.strip() if star_elem else "N/A"
+        highest = highest_elem.text.strip() if highest_elem else "N/A"
+    ratings_data = [handle, rating, star, highest]
+    ranks_section = soup.find('div', class_='rating-ranks')
+    if ranks_section:
+        for item in ranks_section.find_all('li'):
+            rank = item.find('strong').text.strip() if item.find('strong') else "N/A"
+            label = item.get_text(strip=True).replace(rank, "").strip()
+            ranks_data.append([handle, label, rank])
+    for row in BeautifulSoup(sub_html, "html.parser").find_all("tr"):
+        cols = row.find_all("td")
+        if len(cols) == 5:
+            link_tag = cols[4].find("a")
+            solution_link = f"https://www.codechef.com{link_tag['href']}" if link_tag and link_tag.has_attr("href") else "N/A"
+            submissions_data.append([handle, cols[0].text.strip(), cols[1].text.strip(), cols[2].text.strip(),
+                                     cols[3].text.strip(), solution_link])
+    return badges_data, ratings_data, ranks_data, submissions_data
+
+def parser_parse(parser):
+    return lambda html, sub_html, handle: (*parser.parse_profile(html, handle), parser.parse_submissions(sub_html, handle))
+
+def measure(parse, html, sub_html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(html, sub_html, "bench")
+    per_page_ms = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    parse(html, sub_html, "bench")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_page_ms, peak / 1024
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    profile = (FIXTURES / "profiles" / "default.html").read_text(encoding="utf-8").replace("{{handle}}", "bench")
+    padded = profile.replace("<main", PADDING_BLOCK * 120 + "<main", 1)
+    sub_html = json.loads((FIXTURES / "recent" / "default.json").read_text(encoding="utf-8"))["content"]
+    parsers = {"legacy html.parser": legacy_parse, "soup + strainer": parser_parse(SoupProfileParser()),
+               "lxml + xpath": parser_parse(LxmlProfileParser())}
+
+    expected = legacy_parse(profile, sub_html, "bench")
+    for name, parse in parsers.items():
+        assert parse(padded, sub_html, "bench") == expected, f"{name} disagrees with the legacy parser"
+
+    for label, html, repeat in (("fixture", profile, 300), ("padded", padded, 20)):
+        print(f"{label} page: {len(html) / 1024:.1f} KB")
+        print(f"  {'parser':<20}{'ms/page':>10}{'peak KB':>10}")
+        for name, parse in parsers.items():
+            ms, peak_kb = measure(parse, html, sub_html, repeat)
+            print(f"  {name:<20}{ms:>10.2f}{peak_kb:>10.0f}")
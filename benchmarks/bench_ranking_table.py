@@ -0,0 +1,99 @@
+import sys
+import json
+import re
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from bs4 import BeautifulSoup
+from ranking_table import ProblemColumns, extract_rows, find_table, snapshot_from_source
+from stub_server import render_rankings_html
+
+# Extraction time for one 100-row contest ranking page: the old loop in
+# contest.get_usernames_and_contest_data (whole page_source through html.parser,
+# repeated finds per cell) vs ranking_table (table markup only, cells indexed once per
+# row). In a browser the table markup comes from page_snapshot's script; here it is cut
+# out of the saved page. The page is padded to the size of a live ranking page.
+# Run: python benchmarks/bench_ranking_table.py
+
+FIXTURE = ROOT / "fixtures" / "rankings" / "START202D" / "page1.json"
+PADDING_BLOCK = (
+    '<div class="content-widget"><ul class="menu">' + '<li><a href="/practice">Practice</a></li>' * 20 + '</ul>'
+    '<p class="text">' + "Lorem ipsum dolor sit amet. " * 20 + "</p></div>"
+)
+
+def hundred_row_payload():
+    payload = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    base = payload["list"]
+    payload["list"] = [dict(base[i % len(base)], username=f"{base[i % len(base)]['username']}_{i}", rank=1000 + i)
+                       for i in range(100)]
+    payload["problems"] = [(f"P{i}", f"{payload['contest']}_P{i}") for i in range(1, 9)]
+    for row in payload["list"]:
+        row["scores"] = (row["scores"] + ["-"] * 8)[:8]
+    payload["availablePages"] = 2
+    return payload
+
+def legacy_extract(page_source):
+    """The per-page body of the old loop, minus Selenium."""
+    users_data, problem_columns = [], []
+    soup = BeautifulSoup(page_source, "html.parser")
+    page_text = soup.get_text().lower()
+    assert not ("no results" in page_text or "no users" in page_text or "0 results" in page_text)
+    table = soup.find("table", class_=re.compile(r"MuiTable-root.*MUIDataTable-tableRoot"))
+    header_row = table.find("tr", class_=re.compile(r"MuiTableRow-root.*MuiTableRow-head"))
+    for index, header in enumerate(header_row.find_all("th")):
+        problem_label = header.find("a", class_=re.compile(r"_problems__link"))
+        if problem_label and re.match(r"P\d+", problem_label.get_text(strip=True)):
+            problem_columns.append((problem_label.get_text(strip=True), index))
+    existing_problems = {p[0] for p in problem_columns}
+    problem_columns += [(f"P{i}", None) for i in range(1, 9) if f"P{i}" not in existing_problems]
+    for row in table.find_all("tr", class_=re.compile(r"MuiTableRow-root.*MUIDataTableBodyRow-root")):
+        username_cell = row.find("td", {"data-colindex": "1"})
+        username_link = username_cell.find("a", href=re.compile(r"/users/"))
+        username = username_link.find("span", class_="m-username--link").get_text(strip=True) if username_link.find("span", class_="m-username--link") else username_link.get("title", "")
+        user_data = {
+            "Username": username,
+            "Rank": row.find("td", {"data-colindex": "0"}).find("p").get_text(strip=True) if row.find("td", {"data-colindex": "0"}) else "N/A",
+            "Total Score": row.find("td", {"data-colindex": "2"}).find("div", recursive=False).get_text(strip=True) if row.find("td", {"data-colindex": "2"}) else "N/A",
+            "Last AC": row.find("td", {"data-colindex": "3"}).find("p").get_text(strip=True) if row.find("td", {"data-colindex": "3"}) else "N/A"
+        }
+        problem_scores = []
+        for problem, col_index in problem_columns:
+            if col_index is not None:
+                cell = row.find("td", {"data-colindex": str(col_index)})
+                score = cell.find("a").get_text(strip=True) if cell and cell.find("a") else "-"
+            else:
+                score = "-"
+            user_data[problem] = score
+            problem_scores.append(score)
+        user_data["Problems Solved"] = sum(1 for score in problem_scores[:len([p for p, idx in problem_columns if idx is not None])] if score != "-")
+        users_data.append(user_data)
+    soup.find("button", {"aria-label": re.compile(r"Go to next page", re.I)})
+    return users_data
+
+def new_extract(table_html, problems=None):
+    table = find_table(table_html)
+    problems = problems or ProblemColumns.from_header(table)
+    return extract_rows(table, problems)
+
+def per_call_ms(fn, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1000
+
+if __name__ == "__main__":
+    page = render_rankings_html(hundred_row_payload())
+    padded = page.replace("<table", PADDING_BLOCK * 300 + "<table", 1)
+    table_html = snapshot_from_source(padded)["table"]
+    assert new_extract(table_html) == legacy_extract(padded), "ranking_table disagrees with the old loop"
+    problems = ProblemColumns.from_header(find_table(table_html))
+
+    print(f"100-row ranking page: {len(padded) / 1024:.0f} KB page_source, {len(table_html) / 1024:.0f} KB table")
+    legacy = per_call_ms(legacy_extract, padded, 10)
+    print(f"{'old loop over page_source':<36}{legacy:>9.1f} ms")
+    for label, fn in (("ranking_table, first page", new_extract),
+                      ("ranking_table, header cached", lambda html: new_extract(html, problems))):
+        ms = per_call_ms(fn, table_html, 50)
+        print(f"{label:<36}{ms:>9.1f} ms  ({legacy / ms:.0f}x)")
@@ -0,0 +1,61 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import pandas as pd
+from ratings_index import RatingsIndex
+
+# Query latency of RatingsIndex against naive pandas filtering on codechef.csv.
+# Run: python benchmarks/bench_ratings_index.py
+
+def per_call_us(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    csv_path = ROOT / "codechef.csv"
+    cache_path = Path("/tmp") / "codechef.bench.index.pkl"
+    cache_path.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    index = RatingsIndex.from_csv(csv_path, cache_path)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    RatingsIndex.from_csv(csv_path, cache_path)
+    warm = time.perf_counter() - start
+    df = pd.read_csv(csv_path)
+    print(f"Index build: cold {cold * 1000:.1f} ms, from cache {warm * 1000:.1f} ms ({index.n} rows)")
+
+    names = df["Username"].sample(200, random_state=0).tolist()
+    countries = df["Country"].dropna().sample(50, random_state=0).tolist()
+    institutes = df["Institute"].dropna().sample(50, random_state=0).tolist()
+    ranges = [(lo, lo + 100) for lo in range(1, 9000, 180)]
+
+    # Naive pandas equivalents, returning the same row sets (checked below)
+    naive = {
+        "username lookup": (lambda u: df[df["Username"].str.lower() == u.lower()], [(u,) for u in names],
+                            lambda u: index.username_lookup[u.lower()], lambda r: list(r.index)),
+        "top-10 by country": (lambda c: df[df["Country"] == c].sort_values(["Rating", "Global Rank"], ascending=[False, True]).head(10),
+                              [(c,) for c in countries], lambda c: index.top_rows(10, country=c), lambda r: list(r.index)),
+        "top-10 by institute": (lambda i: df[df["Institute"] == i].sort_values(["Rating", "Global Rank"], ascending=[False, True]).head(10),
+                                [(i,) for i in institutes], lambda i: index.top_rows(10, institute=i), lambda r: list(r.index)),
+        "rank range (100)": (lambda lo, hi: df[(df["Global Rank"] >= lo) & (df["Global Rank"] <= hi)],
+                             ranges, lambda lo, hi: index.rank_range_rows(lo, hi), lambda r: list(r.index)),
+    }
+
+    print(f"{'query':<22}{'pandas us':>12}{'index us':>12}{'speedup':>10}")
+    for name, (slow_fn, args_list, fast_fn, to_rows) in naive.items():
+        for args in args_list[:20]:
+            expected = to_rows(slow_fn(*args))
+            actual = fast_fn(*args)
+            actual = [actual] if name == "username lookup" else list(actual)
+            assert expected == actual, f"{name} mismatch for {args}"
+        slow = per_call_us(slow_fn, args_list)
+        fast = per_call_us(fast_fn, args_list)
+        print(f"{name:<22}{slow:>12.1f}{fast:>12.2f}{slow / fast:>9.0f}x")
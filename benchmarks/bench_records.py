@@ -0,0 +1,109 @@
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app import collect_profiles
+from storage import PROFILE_COLUMNS, profile_records, profile_tables, read_tables, write_tables
+from bench_storage import N_USERS, RESULTS, LANGUAGES
+
+# Memory held by the scraped Submissions rows as a list of row lists vs a RecordTable, and
+# the time to turn them into DataFrames and write Parquet ("arrow": the RecordTable written
+# through to_arrow() without a DataFrame, as app.save_to_parquet does). Rows are built with
+# fresh string objects each, as the HTML parser hands them out, so repeated values are not
+# shared already.
+# The second table is the peak while a scrape merges its profiles (arriving in completion
+# order): all results kept until the end and merged into lists, vs app.collect_profiles.
+# Run: python benchmarks/bench_records.py [n_submissions]
+
+def fresh(text):
+    return "".join(list(text))
+
+def submission_rows(n_submissions, seed=42):
+    rng = random.Random(seed)
+    users = [f"user_{i:05d}" for i in range(N_USERS)]
+    for i in range(n_submissions):
+        yield [fresh(rng.choice(users)), f"0{rng.randint(1, 9)}:{rng.randint(10, 59)} PM 1{rng.randint(0, 2)}/{rng.randint(10, 28)}/24",
+               f"PROB{rng.randint(1, 3000):04d}", fresh(rng.choice(RESULTS)), fresh(rng.choice(LANGUAGES)),
+               f"https://www.codechef.com/viewsolution/{1100000000 + i}"]
+
+def profile_results(n_submissions, seed=42):
+    """(handle, (badges, ratings, ranks, submissions)) per user in a shuffled completion order.
+
+    Each user's rows are only built when the user is yielded, as a scrape hands them out.
+    """
+    rng = random.Random(seed)
+    handles = [f"user_{i:05d}" for i in range(N_USERS)]
+    rng.shuffle(handles)
+    counts = [n_submissions // N_USERS + (i < n_submissions % N_USERS) for i in range(N_USERS)]
+    link = 1100000000
+    for handle, count in zip(handles, counts):
+        badges = [[fresh(handle), fresh("Problem Solver - Bronze Badge"), fresh("Received for solving 50 Problems"),
+                   fresh("https://cdn.codechef.com/images/badges/problem/bronze.svg")]]
+        ranks = [[fresh(handle), fresh(label), str(rng.randint(1, 200000))] for label in ("Global Rank", "Country Rank")]
+        subs = [[fresh(handle), f"0{rng.randint(1, 9)}:{rng.randint(10, 59)} PM 1{rng.randint(0, 2)}/{rng.randint(10, 28)}/24",
+                 f"PROB{rng.randint(1, 3000):04d}", fresh(rng.choice(RESULTS)), fresh(rng.choice(LANGUAGES)),
+                 f"https://www.codechef.com/viewsolution/{link + i}"] for i in range(count)]
+        link += count
+        yield handle, (badges, [fresh(handle), str(rng.randint(900, 2200)), fresh("2★"), "(Highest Rating 1800)"],
+                       ranks, subs)
+
+def merge_as_lists(users, profiles):
+    """scrape_profiles before collect_profiles: every result kept, then merged in user order."""
+    results = dict(profiles)
+    tables = ([], [], [], [])
+    for handle in users:
+        badges, ratings, ranks, subs = results.pop(handle)
+        tables[0].extend(badges)
+        tables[1].append(ratings)
+        tables[2].extend(ranks)
+        tables[3].extend(subs)
+    return tables
+
+def merge_peak(kind, n_submissions):
+    users = [f"user_{i:05d}" for i in range(N_USERS)]
+    merge = merge_as_lists if kind == "lists" else collect_profiles
+    tracemalloc.start()
+    tables = merge(users, profile_results(n_submissions))
+    held_mb, peak_mb = (value / 1e6 for value in tracemalloc.get_traced_memory())
+    tracemalloc.stop()
+    assert len(tables[3]) == n_submissions
+    return peak_mb, held_mb
+
+def run_case(kind, n_submissions):
+    tracemalloc.start()
+    submissions = [] if kind == "lists" else profile_records()["Submissions"]
+    keep_records = kind == "arrow"
+    submissions.extend(submission_rows(n_submissions))
+    held_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    tables = profile_tables([], [], [], [], submissions, keep_records=keep_records)
+    frame_s = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        write_tables(tables, tmp)
+        parquet_s = time.perf_counter() - start
+        written = read_tables(tmp, ["Submissions"])["Submissions"]
+    assert len(written) == n_submissions
+    assert list(written.columns) == PROFILE_COLUMNS["Submissions"]
+    return held_mb, frame_s, parquet_s
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    n_submissions = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{n_submissions} submissions of {N_USERS} users")
+    print(f"{'rows as':<14}{'held MB':>10}{'frame s':>10}{'parquet s':>11}")
+    for kind in ("lists", "RecordTable", "arrow"):
+        held_mb, frame_s, parquet_s = run_case(kind, n_submissions)
+        print(f"{kind:<14}{held_mb:>10.1f}{frame_s:>10.3f}{parquet_s:>11.3f}")
+
+    print(f"\n{'merged as':<14}{'peak MB':>10}{'held MB':>10}")
+    for kind in ("lists", "RecordTable"):
+        peak_mb, held_mb = merge_peak(kind, n_submissions)
+        print(f"{kind:<14}{peak_mb:>10.1f}{held_mb:>10.1f}")
@@ -0,0 +1,73 @@
+import sys
+import time
+import random
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from storage import profile_tables, write_tables, read_tables, export_excel
+import pandas as pd
+
+# Write/read time and peak RSS of the profile tables as xlsx vs Parquet on a synthetic
+# institution dump. Each case runs in a fresh process so ru_maxrss is not shared.
+# Run: python benchmarks/bench_storage.py [n_submissions]
+
+N_USERS = 2000
+RESULTS = ["Accepted", "Wrong Answer", "Time Limit Exceeded", "Runtime Error", "Compilation Error"]
+LANGUAGES = ["C++", "PYTH 3", "JAVA", "C", "PYPY3"]
+
+def synthetic_dump(n_submissions, seed=42):
+    rng = random.Random(seed)
+    users = [f"user_{i:05d}" for i in range(N_USERS)]
+    badges = [[u, f"Problem Solver - {m} Badge", f"Received for solving {n} Problems", f"https://cdn.codechef.com/images/badges/problem/{m.lower()}.svg"]
+              for u in users for m, n in (("Bronze", 50), ("Silver", 100))]
+    ratings = [[u, str(rng.randint(900, 2200)), f"{rng.randint(1, 5)}★", f"(Highest Rating {rng.randint(1000, 2300)})"] for u in users]
+    ranks = [[u, label, str(rng.randint(1, 200000))] for u in users for label in ("Global Rank", "Country Rank")]
+    submissions = [
+        [rng.choice(users), f"0{rng.randint(1, 9)}:{rng.randint(10, 59)} PM 1{rng.randint(0, 2)}/{rng.randint(10, 28)}/24",
+         f"PROB{rng.randint(1, 3000):04d}", rng.choice(RESULTS), rng.choice(LANGUAGES),
+         f"https://www.codechef.com/viewsolution/{1100000000 + i}"]
+        for i in range(n_submissions)
+    ]
+    return profile_tables(users, badges, ratings, ranks, submissions)
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def run_case(fmt, n_submissions, queue):
+    tables = synthetic_dump(n_submissions)
+    baseline = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        if fmt == "xlsx":
+            export_excel(tables, Path(tmp) / "profiles.xlsx")
+        else:
+            write_tables(tables, tmp, fmt=fmt)
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if fmt == "xlsx":
+            loaded = pd.read_excel(Path(tmp) / "profiles.xlsx", sheet_name=None, engine="openpyxl")
+        else:
+            loaded = read_tables(tmp, fmt=fmt)
+        read_s = time.perf_counter() - start
+        size = sum(p.stat().st_size for p in Path(tmp).iterdir())
+    assert len(loaded["Submissions"]) == n_submissions
+    queue.put((write_s, read_s, peak_rss_mb() - baseline, size / 1e6))
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    n_submissions = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Synthetic dump: {N_USERS} users, {n_submissions} submissions")
+    print(f"{'format':<10}{'write s':>10}{'read s':>10}{'peak MB':>10}{'size MB':>10}")
+    for fmt in ("xlsx", "parquet", "feather"):
+        queue = multiprocessing.Queue()
+        proc = multiprocessing.Process(target=run_case, args=(fmt, n_submissions, queue))
+        proc.start()
+        write_s, read_s, peak_mb, size_mb = queue.get()
+        proc.join()
+        print(f"{fmt:<10}{write_s:>10.2f}{read_s:>10.2f}{peak_mb:>10.1f}{size_mb:>10.2f}")
@@ -0,0 +1,257 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import pandas as pd
+import requests
+from selenium.webdriver.support import wait as selenium_wait
+
+import app
+import contest
+import predict
+import waits
+from http_client import create_session
+from inference import ModelService
+from listing_backends import HttpListingBackend
+from ranking_table import SNAPSHOT_SCRIPT, snapshot_from_source
+from stub_server import start_stub_server
+
+# Offline end-to-end suite: the scrapers run against stub_server replaying fixtures that are
+# generated for each scale (N users on the ratings listing, N rows on a contest ranking,
+# N profiles), then the saved data goes through Excel, preprocessing, training and inference.
+#   listing      app.get_usernames_from_institution   (JSON ratings API, 50 users per page)
+#   contest      contest.get_usernames_and_contest_data (replayed pages instead of Chrome)
+#   profiles     app.scrape_user_profile for every user, through app.scrape_profiles
+#   excel        app.save_to_excel of the scraped rows
+#   preprocess   predict.load_and_preprocess of the contest table
+#   train        predict.build_and_evaluate_models (no search)
+#   inference    inference.ModelService.predict_frame over the contest table
+# Selenium waits and the pauses between pages are skipped, so "contest" times the work around them.
+# Each result is compared with benchmarks/baseline.json; a benchmark more than --threshold
+# times slower than its baseline (and slower by at least NOISE_SECONDS) is a regression,
+# and the exit status is 1.
+# Run: python benchmarks/run_all.py [--scales 100 1000 10000] [--only listing profiles] [--update-baseline]
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SCALES = [100, 1_000, 10_000]
+BENCHMARKS = ["listing", "contest", "profiles", "excel", "preprocess", "train", "inference"]
+NOISE_SECONDS = 0.05
+CONTEST = "BENCH001"
+INSTITUTION = "Benchmark Institute of Technology"
+
+def usernames(n):
+    return [f"bench_user{i:05d}" for i in range(n)]
+
+def write_fixtures(directory, n, seed=42):
+    """Fixture tree for `n` users: ratings listing, one contest ranking, profile and submissions templates."""
+    rng = random.Random(seed)
+    shutil.copytree(ROOT / "fixtures" / "profiles", directory / "profiles")
+    (directory / "recent").mkdir()
+    shutil.copy(ROOT / "fixtures" / "recent" / "default.json", directory / "recent" / "default.json")
+
+    names = usernames(n)
+    (directory / "ratings").mkdir()
+    pages = -(-n // 50)
+    for page in range(1, pages + 1):
+        rows = [{"global_rank": 1000 + i, "username": name, "rating": rng.randint(1000, 2500), "institution": INSTITUTION}
+                for i, name in enumerate(names[(page - 1) * 50:page * 50], start=(page - 1) * 50)]
+        payload = {"list": rows, "availablePages": pages, "totalItems": n, "currentPage": page, "status": "success"}
+        (directory / "ratings" / f"page{page}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    ranking_dir = directory / "rankings" / CONTEST
+    ranking_dir.mkdir(parents=True)
+    problems = [[f"P{i}", f"{CONTEST}_P{i}"] for i in range(1, 5)]
+    pages = -(-n // 100)
+    for page in range(1, pages + 1):
+        rows = []
+        for rank, name in enumerate(names[(page - 1) * 100:page * 100], start=(page - 1) * 100 + 1):
+            scores = [str(rng.choice([100, 100, 50, 20])) if rng.random() < 0.8 - rank / (n * 2) else "-" for _ in problems]
+            rows.append({"username": name, "rank": rank, "total_score": sum(int(s) for s in scores if s != "-"),
+                         "last_ac": f"{rng.randint(0, 2)}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}", "scores": scores})
+        payload = {"contest": CONTEST, "problems": problems, "list": rows, "currentPage": page, "availablePages": pages}
+        (ranking_dir / f"page{page}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+class ReplayDriver:
+    """Just enough of a Chrome WebDriver for contest.py: pages come from the stub over HTTP."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.page_source = ""
+
+    def get(self, url):
+        self.page_source = self.session.get(url.replace(app.BASE_URL, self.base_url), timeout=10).text
+
+    def execute_cdp_cmd(self, cmd, params):
+        raise NotImplementedError("no CDP in replayed pages")
+
+    def execute_script(self, script, *args):
+        if script == SNAPSHOT_SCRIPT:
+            return snapshot_from_source(self.page_source)
+        if script == waits.STATE_SCRIPT:  # a replayed page is complete as soon as it is fetched
+            return {"ready": "complete", "rows": self.page_source.count("MUIDataTableBodyRow-root"), "loading": False,
+                    "pending": 0, "quiet_ms": None, "server_ms": None}
+        return None
+
+class ReplayPool:
+    """driver_pool.DriverPool interface around one ReplayDriver."""
+
+    def __init__(self, base_url):
+        self.driver = ReplayDriver(base_url)
+
+    def acquire(self):
+        return self.driver
+
+    def record_page(self, driver):
+        pass
+
+    def is_healthy(self, driver):
+        return True
+
+    def release(self, driver, broken=False):
+        pass
+
+@contextmanager
+def without_sleeps(*modules):
+    """Replace each module's time with one whose sleep() returns at once."""
+    originals = [module.time for module in modules]
+    for module in modules:
+        module.time = types.SimpleNamespace(**dict(vars(time), sleep=lambda seconds: None))
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, originals):
+            module.time = original
+
+@contextmanager
+def quiet():
+    """Silence print() from the code under test."""
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+def run_scale(n, only, workdir):
+    """{benchmark: {"seconds", "items"}} for one scale."""
+    fixtures = workdir / "fixtures"
+    write_fixtures(fixtures, n)
+    server, base_url = start_stub_server(fixtures)
+    results = {}
+    state = {}
+
+    def timed(name, fn, items):
+        if name not in only:
+            return
+        start = time.perf_counter()
+        with quiet():
+            state[name] = fn()
+        seconds = time.perf_counter() - start
+        results[name] = {"seconds": round(seconds, 4), "items": items(state[name])}
+        print(f"  {name:<12}{seconds:>9.3f} s  {results[name]['items'] / seconds:>10.0f} items/s")
+
+    def contest_rows():
+        with without_sleeps(contest, waits, selenium_wait):
+            return contest.get_usernames_and_contest_data(CONTEST, INSTITUTION, -(-n // 100), pool=ReplayPool(base_url))
+
+    def scraped_profiles():
+        return app.scrape_profiles(users, create_session(4), {}, workers=4, requests_per_second=10_000, base_url=base_url)
+
+    try:
+        timed("listing", lambda: app.get_usernames_from_institution(
+            INSTITUTION, -(-n // 50), backends=[HttpListingBackend(session=create_session(4), base_url=base_url)]), len)
+        timed("contest", contest_rows, lambda result: len(result[0]))
+
+        users = state.get("listing") or usernames(n)
+        timed("profiles", scraped_profiles, lambda tables: sum(len(rows) for rows in tables))
+        if "excel" in only:
+            tables = state.get("profiles") or scraped_profiles()
+            timed("excel", lambda: app.save_to_excel(users, *tables, workdir / "profiles.xlsx"),
+                  lambda _: sum(len(rows) for rows in tables) + len(users))
+
+        if only & {"preprocess", "train", "inference"}:
+            contest_path = workdir / f"codechef_{CONTEST}_contest_data.parquet"
+            pd.DataFrame((state.get("contest") or contest_rows())[0]).to_parquet(contest_path, index=False)
+            timed("preprocess", lambda: predict.load_and_preprocess(contest_path), lambda result: len(result[0]))
+            with quiet():
+                df = state["preprocess"][0] if "preprocess" in state else predict.load_and_preprocess(contest_path)[0]
+            timed("train", lambda: predict.build_and_evaluate_models(df), lambda _: len(df))
+            if "train" not in state:
+                with quiet():
+                    predict.build_and_evaluate_models(df)
+            service = ModelService()
+            timed("inference", lambda: service.predict_frame(df), len)
+    finally:
+        server.shutdown()
+    return results
+
+def compare(results, baseline, threshold):
+    """Rows of (scale, benchmark, seconds, baseline seconds or None, ratio or None, regressed)."""
+    rows = []
+    for scale, benches in results.items():
+        for name, result in benches.items():
+            base = baseline.get(scale, {}).get(name)
+            if base is None:
+                rows.append((scale, name, result["seconds"], None, None, False))
+                continue
+            ratio = result["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            regressed = ratio > threshold and result["seconds"] - base["seconds"] > NOISE_SECONDS
+            rows.append((scale, name, result["seconds"], base["seconds"], ratio, regressed))
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark suite against the stub CodeChef server.")
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES, help="users per run")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--threshold", type=float, default=1.3, help="slowdown ratio that counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run's results as the baseline")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)  # the scrapers log every page and profile
+
+    results = {}
+    root_cwd = Path.cwd()
+    for n in args.scales:
+        print(f"{n} users")
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # training writes processed_features.csv and the joblib models to the cwd
+            try:
+                results[str(n)] = run_scale(n, set(args.only), Path(tmp))
+            finally:
+                os.chdir(root_cwd)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {"results": {}}
+    rows = compare(results, baseline["results"], args.threshold)
+    print(f"\n{'scale':>6}  {'benchmark':<12}{'seconds':>10}{'baseline':>10}{'ratio':>8}")
+    for scale, name, seconds, base, ratio, regressed in rows:
+        base_text = f"{base:>10.3f}" if base is not None else f"{'-':>10}"
+        ratio_text = f"{ratio:>7.2f}x" if ratio is not None else f"{'-':>8}"
+        print(f"{scale:>6}  {name:<12}{seconds:>10.3f}{base_text}{ratio_text}{'  REGRESSION' if regressed else ''}")
+
+    if args.update_baseline:
+        for scale, benches in results.items():
+            baseline["results"].setdefault(scale, {}).update(benches)
+        baseline["machine"] = {"python": platform.python_version(), "platform": platform.platform(),
+                               "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()}
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"✅ Baseline written to {baseline_path}")
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over {args.threshold}x the baseline")
+        sys.exit(1)
+    print("✅ No regressions against the baseline")
@@ -0,0 +1,173 @@
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from features import extract_numbers
+from storage import PROFILE_COLUMNS, read_tables
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Precomputes what leaderboard.html and compare.html used to derive in the browser from the
+# whole workbook. Layout of the output directory:
+#   manifest.json          source hash, counts, star distribution, file list
+#   leaderboard.json       one row per user plus the precomputed sort orders
+#   compare/index.json     username -> shard number
+#   compare/shard-NNN.json comparison vectors for `shard_size` users each
+# The pages fetch the manifest first and append its hash to every other URL, so browsers
+# may cache the rest for as long as the source data does not change.
+
+BUILD_VERSION = 1  # bump when the output layout changes to force a rebuild
+LEADERBOARD_COLUMNS = ["username", "rating", "highestRating", "badges", "submissions", "globalRank", "stars"]
+COMPARE_METRICS = ["rating", "highestRating", "badges", "submissions", "globalRank", "stars"]
+SORT_KEYS = ["rating", "highestRating", "badges", "submissions", "globalRank"]
+# CodeChef star bands: the lowest rating for 2★ .. 7★
+STAR_THRESHOLDS = [1400, 1600, 1800, 2000, 2200, 2500]
+
+def source_files(source):
+    """Files the dashboards are built from: the workbook or the Parquet tables of app.py."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(source / f"{name}.parquet" for name in PROFILE_COLUMNS)
+    return [source]
+
+def source_hash(source):
+    digest = hashlib.sha256(f"v{BUILD_VERSION}".encode())
+    for path in source_files(source):
+        digest.update(path.name.encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def load_tables(source):
+    source = Path(source)
+    if source.is_dir():
+        return read_tables(source)
+    return pd.read_excel(source, sheet_name=list(PROFILE_COLUMNS), engine="openpyxl")
+
+def stars_for(ratings):
+    return np.searchsorted(STAR_THRESHOLDS, ratings, side="right") + 1
+
+def per_user(df, column="Username"):
+    names = df[column].astype("string").str.strip()
+    return df.assign(**{column: names})[names.notna() & names.ne("")]
+
+def build_rows(tables):
+    """Merge the profile tables into one row per user (same rules the pages applied in JS)."""
+    users = per_user(tables["Users"]).drop_duplicates("Username")
+
+    badges = per_user(tables["Badges"])
+    badge_counts = badges[badges["Title"] != "No Badges Earned"].groupby("Username").size()
+
+    ratings = per_user(tables["Ratings"]).drop_duplicates("Username").set_index("Username")
+    rating = extract_numbers(ratings["Rating"]).fillna(0)
+    highest = extract_numbers(ratings["Highest"]).fillna(0)
+
+    ranks = per_user(tables["Ranks"])
+    global_rank = ranks[ranks["Label"].astype("string").str.strip() == "Global Rank"]
+    global_rank = extract_numbers(global_rank.drop_duplicates("Username").set_index("Username")["Rank"])
+
+    subs = per_user(tables["Submissions"])
+    accepted = subs["Result"].astype("string").str.contains("(100)", regex=False, na=False)
+    submission_counts = subs[accepted].groupby("Username").size()
+
+    df = pd.DataFrame({"username": users["Username"].to_numpy(dtype=object)})
+    df["rating"] = df["username"].map(rating).fillna(0).astype(int)
+    df["highestRating"] = df["username"].map(highest).fillna(0).astype(int)
+    df["badges"] = df["username"].map(badge_counts).fillna(0).astype(int)
+    df["submissions"] = df["username"].map(submission_counts).fillna(0).astype(int)
+    df["globalRank"] = df["username"].map(global_rank).astype("Int64")
+    df["stars"] = stars_for(df["rating"].to_numpy())
+    return df.sort_values(["rating", "username"], ascending=[False, True], ignore_index=True)
+
+def sort_orders(df):
+    """Row positions for every sort key, descending; the page reverses them for ascending."""
+    orders = {}
+    for key in SORT_KEYS:
+        values = df[key].astype(float).fillna(-np.inf).to_numpy()
+        orders[key] = np.lexsort((np.arange(len(df)), -values)).tolist()
+    return orders
+
+def to_records(df, columns):
+    rows = df[columns].astype(object).where(df[columns].notna(), None).to_numpy().tolist()
+    return [[int(v) if isinstance(v, (np.integer, int)) and not isinstance(v, bool) else v for v in row] for row in rows]
+
+def write_json(path, payload):
+    """Write atomically so a page never reads a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+def read_manifest(out_dir):
+    path = Path(out_dir) / "manifest.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def build(source="codechefprofiles.xlsx", out_dir="dashboard_data", shard_size=500, force=False):
+    """Rebuild the dashboard JSON when `source` changed. Returns the manifest."""
+    out_dir = Path(out_dir)
+    digest = source_hash(source)
+    manifest = read_manifest(out_dir)
+    if not force and manifest and manifest.get("source_hash") == digest:
+        logging.info(f"Dashboard data in {out_dir} is up to date with {source} ({digest})")
+        return manifest
+
+    df = build_rows(load_tables(source))
+    write_json(out_dir / "leaderboard.json", {
+        "columns": LEADERBOARD_COLUMNS,
+        "rows": to_records(df, LEADERBOARD_COLUMNS),
+        "order": sort_orders(df),
+    })
+
+    by_name = df.sort_values("username", ignore_index=True)
+    shard_files = []
+    index = {}
+    for shard, start in enumerate(range(0, len(by_name), shard_size)):
+        chunk = by_name.iloc[start:start + shard_size]
+        name = f"compare/shard-{shard:03d}.json"
+        write_json(out_dir / name, dict(zip(chunk["username"], to_records(chunk, COMPARE_METRICS))))
+        index.update(dict.fromkeys(chunk["username"], shard))
+        shard_files.append(name)
+    write_json(out_dir / "compare/index.json", index)
+    for stale in (out_dir / "compare").glob("shard-*.json"):
+        if f"compare/{stale.name}" not in shard_files:
+            stale.unlink()
+
+    stars = pd.Series(df["stars"]).value_counts().reindex(range(1, len(STAR_THRESHOLDS) + 2), fill_value=0)
+    manifest = {
+        "version": BUILD_VERSION,
+        "source": str(source),
+        "source_hash": digest,
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "users": int(len(df)),
+        "star_distribution": {f"{s}★": int(n) for s, n in stars.items()},
+        "leaderboard": "leaderboard.json",
+        "compare_metrics": COMPARE_METRICS,
+        "compare_index": "compare/index.json",
+        "compare_shards": shard_files,
+    }
+    write_json(out_dir / "manifest.json", manifest)  # written last: it switches readers to the new files
+    logging.info(f"Built dashboard data for {len(df)} users in {out_dir} ({len(shard_files)} compare shards)")
+    return manifest
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the JSON behind leaderboard.html and compare.html.")
+    parser.add_argument("source", nargs="?", default="codechefprofiles.xlsx", help="profile workbook or Parquet table directory")
+    parser.add_argument("-o", "--out-dir", default="dashboard_data")
+    parser.add_argument("--shard-size", type=int, default=500, help="users per compare shard")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the source is unchanged")
+    args = parser.parse_args()
+
+    manifest = build(args.source, args.out_dir, args.shard_size, args.force)
+    print(f"✅ {manifest['users']} users, stars {manifest['star_distribution']}, source {manifest['source_hash']}")
@@ -0,0 +1,72 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class CheckpointStore:
+    """SQLite-backed store of scrape_user_profile results, committed one handle at a time.
+
+    Each row keeps the four lists returned by scrape_user_profile as JSON plus the time it
+    was scraped, so an interrupted run can resume and skip handles that are still fresh.
+    A row saved as `partial` (its submissions could not be fetched) is never fresh.
+    """
+
+    def __init__(self, path="scrape_checkpoint.sqlite3"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " handle TEXT PRIMARY KEY,"
+            " scraped_at REAL NOT NULL,"
+            " badges TEXT NOT NULL,"
+            " ratings TEXT NOT NULL,"
+            " ranks TEXT NOT NULL,"
+            " submissions TEXT NOT NULL,"
+            " partial INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(profiles)")}
+        if "partial" not in columns:  # store written before the flag existed
+            self.conn.execute("ALTER TABLE profiles ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def save(self, handle, result, scraped_at=None, partial=False):
+        badges, ratings, ranks, submissions = result
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (handle, scraped_at or time.time(), json.dumps(badges), json.dumps(ratings),
+                 json.dumps(ranks), json.dumps(submissions), int(partial)),
+            )
+            self.conn.commit()
+
+    def load(self, handle):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT badges, ratings, ranks, submissions FROM profiles WHERE handle = ?", (handle,)
+            ).fetchone()
+        if row is None:
+            return None
+        return tuple(json.loads(col) for col in row)
+
+    def fresh_handles(self, handles, max_age_seconds):
+        """Return the subset of `handles` fully scraped within the last `max_age_seconds`."""
+        cutoff = time.time() - max_age_seconds
+        with self.lock:
+            rows = self.conn.execute("SELECT handle FROM profiles WHERE scraped_at >= ? AND partial = 0", (cutoff,)).fetchall()
+        stored = {row[0] for row in rows}
+        return {h for h in handles if h in stored}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
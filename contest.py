@@ -1,36 +1,37 @@
+import argparse
 import urllib.parse
 import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 import time
 import logging
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 import pandas as pd
-from bs4 import BeautifulSoup
+from driver_pool import DriverPool, create_driver
+from instrumentation import count, stage, start_run
+from ranking_table import BODY_ROW_SELECTOR, ProblemColumns, extract_rows, find_table, page_snapshot
+from storage import write_table
+from waits import AdaptiveDelay, wait_until_settled
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def setup_selenium_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--log-level=3")
-    return webdriver.Chrome(options=chrome_options)
-
-def get_usernames_and_contest_data(contest_code, institution, max_pages_limit=20, max_retries=3):
+    return create_driver()
+
+def new_page_delay():
+    """Pause between ranking pages: 1.5x the server's response time, at least 1 s (was 2-5 s of jitter)."""
+    return AdaptiveDelay(min_delay=1.0, max_delay=30.0)
+
+def get_usernames_and_contest_data(contest_code, institution, max_pages_limit=20, max_retries=3, pool=None, delay=None):
     users_data = []
     seen_usernames = set()  # Track unique usernames to prevent duplicates
     institution_encoded = urllib.parse.quote(institution)
     page = 1
-    driver = setup_selenium_driver()
-    problem_columns = []
+    # With a DriverPool the session is leased and handed back warm instead of quit
+    driver = pool.acquire() if pool else setup_selenium_driver()
+    problems = None  # ProblemColumns, read from the first page's header
+    delay = delay or new_page_delay()
 
     try:
         while page <= max_pages_limit:
@@ -43,81 +44,58 @@ def get_usernames_and_contest_data(contest_code, institution, max_pages_limit=20
 
             for attempt in range(max_retries):
                 try:
-                    driver.get(url)
-                    wait = WebDriverWait(driver, 30)
-                    wait.until_not(EC.presence_of_element_located((By.CLASS_NAME, "loadingIcon")))
-                    time.sleep(2)
+                    started = time.perf_counter()
+                    with stage("fetch"):
+                        driver.get(url)
+                        if pool:
+                            pool.record_page(driver)
+                    # Rows rendered, requests finished and the DOM quiet, instead of a fixed 2 s
+                    with stage("settle_wait"):
+                        state = wait_until_settled(driver, BODY_ROW_SELECTOR, timeout=30)
+                    server_ms = state.get("server_ms")
+                    delay.observe(server_ms / 1000 if server_ms else time.perf_counter() - started, throttled=attempt > 0)
                     break
                 except Exception as e:
                     logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for page {page}: {e}")
                     if attempt + 1 == max_retries:
                         logging.error(f"Max retries reached for page {page}, skipping")
-                        return users_data
-                    time.sleep(2 ** attempt + random.uniform(2.0, 5.0))
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            page_text = soup.get_text().lower()
-            if "no results" in page_text or "no users" in page_text or "0 results" in page_text:
+                        return users_data, problems.names if problems else []
+                    count("retries")
+                    with stage("backoff"):
+                        time.sleep(2 ** attempt + random.uniform(2.0, 5.0))
+
+            count("pages")
+            with stage("snapshot"):
+                snapshot = page_snapshot(driver)
+            if snapshot["no_results"]:
                 logging.info(f"No results found on page {page}")
                 break
 
-            table = soup.find("table", class_=re.compile(r"MuiTable-root.*MUIDataTable-tableRoot"))
-            if not table:
-                logging.error(f"No table found on page {page}. Page title: {soup.title.get_text() if soup.title else 'No title'}")
+            with stage("parse"):
+                table = find_table(snapshot["table"]) if snapshot["table"] else None
+                if table is not None:
+                    # Problem columns come from the header once per contest
+                    if problems is None:
+                        problems = ProblemColumns.from_header(table)
+                    page_users = extract_rows(table, problems)
+            if table is None:
+                logging.error(f"No table found on page {page}. Page title: {snapshot['title'] or 'No title'}")
                 break
 
-            # Extract problem numbers from table headers
-            if not problem_columns:  # Only extract headers once
-                header_row = table.find("tr", class_=re.compile(r"MuiTableRow-root.*MuiTableRow-head"))
-                if header_row:
-                    headers = header_row.find_all("th")
-                    for index, header in enumerate(headers):
-                        problem_label = header.find("a", class_=re.compile(r"_problems__link"))
-                        if problem_label and re.match(r"P\d+", problem_label.get_text(strip=True)):
-                            problem_columns.append((problem_label.get_text(strip=True), index))
-                # Ensure P1–P8 are included, even if not in headers
-                existing_problems = {p[0] for p in problem_columns}
-                for i in range(1, 9):  # P1 to P8
-                    problem = f"P{i}"
-                    if problem not in existing_problems:
-                        problem_columns.append((problem, None))
-
-            rows = table.find_all("tr", class_=re.compile(r"MuiTableRow-root.*MUIDataTableBodyRow-root"))
-            if len(rows) <= 0:
+            if not page_users:
                 logging.warning(f"No data rows found on page {page}")
                 break
 
             page_usernames = set()
-            for row in rows:
-                username_cell = row.find("td", {"data-colindex": "1"})
-                if username_cell:
-                    username_link = username_cell.find("a", href=re.compile(r"/users/"))
-                    if username_link:
-                        username = username_link.find("span", class_="m-username--link").get_text(strip=True) if username_link.find("span", class_="m-username--link") else username_link.get("title", "")
-                        if username and username not in seen_usernames:  # Check for duplicates
-                            seen_usernames.add(username)
-                            user_data = {
-                                "Username": username,
-                                "Rank": row.find("td", {"data-colindex": "0"}).find("p").get_text(strip=True) if row.find("td", {"data-colindex": "0"}) else "N/A",
-                                "Total Score": row.find("td", {"data-colindex": "2"}).find("div", recursive=False).get_text(strip=True) if row.find("td", {"data-colindex": "2"}) else "N/A",
-                                "Last AC": row.find("td", {"data-colindex": "3"}).find("p").get_text(strip=True) if row.find("td", {"data-colindex": "3"}) else "N/A"
-                            }
-                            # Extract scores for each problem
-                            problem_scores = []
-                            for problem, col_index in problem_columns:
-                                if col_index is not None:
-                                    cell = row.find("td", {"data-colindex": str(col_index)})
-                                    score = cell.find("a").get_text(strip=True) if cell and cell.find("a") else "-"
-                                else:
-                                    score = "-"  # For P5–P8 if not in table
-                                user_data[problem] = score
-                                problem_scores.append(score)
-                            # Count problems solved (only for actual problems in table)
-                            user_data["Problems Solved"] = sum(1 for score in problem_scores[:len([p for p, idx in problem_columns if idx is not None])] if score != "-")
-                            users_data.append(user_data)
-                            page_usernames.add(username)
+            for user_data in page_users:
+                username = user_data["Username"]
+                if username not in seen_usernames:  # Check for duplicates
+                    seen_usernames.add(username)
+                    users_data.append(user_data)
+                    page_usernames.add(username)
 
             new_users = len(page_usernames)
+            count("rows", new_users)
             logging.info(f"Extracted {new_users} users from page {page}. Total so far: {len(users_data)}")
 
             if new_users == 0:
@@ -127,24 +105,25 @@ def get_usernames_and_contest_data(contest_code, institution, max_pages_limit=20
                 logging.info(f"Partial page {page} ({len(page_usernames)} users < 100), likely last page")
                 break
 
-            next_button = soup.find("button", {"aria-label": re.compile(r"Go to next page", re.I)}) or \
-                          soup.find("button", string=re.compile(r"Next", re.I)) or \
-                          soup.find("button", class_=re.compile(r"MuiPaginationItem.*next"))
-            if not next_button or ("disabled" in next_button.get("class", []) or next_button.get("disabled") or "true" in next_button.get("aria-disabled", "")):
+            if not snapshot["has_next"]:
                 logging.info("Next button disabled or not found - no more pages")
                 break
 
             page += 1
-            time.sleep(random.uniform(2.0, 5.0))
+            with stage("page_delay"):
+                delay.wait()
 
     except Exception as e:
         logging.error(f"Error during extraction: {e}")
     finally:
-        driver.quit()
+        if pool:
+            pool.release(driver, broken=not pool.is_healthy(driver))
+        else:
+            driver.quit()
 
-    return users_data, [p[0] for p in problem_columns]
+    return users_data, problems.names if problems else []
 
-def print_and_save_contest_data(users_data, contest_code, problem_columns):
+def print_and_save_contest_data(users_data, contest_code, problem_columns, excel=True):
     if not users_data:
         print(f"No users found for contest {contest_code}")
         return
@@ -159,17 +138,112 @@ def print_and_save_contest_data(users_data, contest_code, problem_columns):
         for problem in problem_columns:
             print(f"{problem}: {user[problem]}")
 
-    # Save to Excel
+    # Save to Parquet (primary) and optionally Excel
     df = pd.DataFrame(users_data)
-    excel_filename = f"codechef_{contest_code}_contest_data.xlsx"
-    df.to_excel(excel_filename, index=False, engine='openpyxl')
-    logging.info(f"Contest data saved to {excel_filename}")
-    print(f"\nData saved to {excel_filename}")
+    parquet_filename = f"codechef_{contest_code}_contest_data.parquet"
+    with stage("persist"):
+        write_table(df, parquet_filename)
+    logging.info(f"Contest data saved to {parquet_filename}")
+    print(f"\nData saved to {parquet_filename}")
+    if excel:
+        excel_filename = f"codechef_{contest_code}_contest_data.xlsx"
+        with stage("persist"):
+            write_table(df, excel_filename)
+        logging.info(f"Contest data exported to {excel_filename}")
+
+def expand_contest_codes(specs):
+    """Expand codes such as "START200D..START205D" into every code in the range."""
+    codes = []
+    for spec in specs:
+        if ".." not in spec:
+            codes.append(spec)
+            continue
+        start, end = spec.split("..", 1)
+        m_start = re.fullmatch(r"([A-Za-z]*)(\d+)([A-Za-z]*)", start)
+        m_end = re.fullmatch(r"([A-Za-z]*)(\d+)([A-Za-z]*)", end)
+        if not m_start or not m_end or m_start.group(1) != m_end.group(1) or m_start.group(3) != m_end.group(3):
+            raise ValueError(f"Invalid contest range: {spec}")
+        prefix, suffix = m_start.group(1), m_start.group(3)
+        for number in range(int(m_start.group(2)), int(m_end.group(2)) + 1):
+            codes.append(f"{prefix}{number}{suffix}")
+    return codes
+
+def fetch_contest_batch(contest_codes, institutions, workers=2, pool=None):
+    """Fetch every (contest, institution) ranking with at most `workers` in flight.
+
+    Returns one DataFrame with Contest and Institution columns prepended, unique on
+    (Contest, Username). Pass a DriverPool sized to `workers` so Chrome sessions are reused.
+    """
+    jobs = [(code, institution) for code in contest_codes for institution in institutions]
+    frames = []
+    delay = new_page_delay()  # every worker hits the same host, so they share one view of its response times
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(get_usernames_and_contest_data, code, institution, pool=pool, delay=delay): (code, institution)
+            for code, institution in jobs
+        }
+        for future in as_completed(futures):
+            code, institution = futures[future]
+            try:
+                users_data, problem_columns = future.result()
+            except Exception as e:
+                logging.error(f"Failed to fetch {code} for {institution}: {e}")
+                continue
+            logging.info(f"Fetched {len(users_data)} users for {code} / {institution}")
+            if users_data:
+                frame = pd.DataFrame(users_data)
+                frame.insert(0, "Institution", institution)
+                frame.insert(0, "Contest", code)
+                frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=["Contest", "Institution", "Username"])
+    df = pd.concat(frames, ignore_index=True)
+    return df.drop_duplicates(subset=["Contest", "Username"], keep="first").reset_index(drop=True)
+
+def save_contest_store(df, store_path="contest_results.parquet"):
+    """Merge rows into one Parquet store keyed by (Contest, Username); newer rows win."""
+    store_path = Path(store_path)
+    with stage("persist"):
+        if store_path.exists():
+            df = pd.concat([pd.read_parquet(store_path), df], ignore_index=True)
+            df = df.drop_duplicates(subset=["Contest", "Username"], keep="last")
+        # Scores are a mix of numbers and "-", keep them as text so the columns have one type
+        df = df.astype({c: "string" for c in df.columns if df[c].dtype == object})
+        df = df.sort_values(["Contest", "Institution"], kind="stable").reset_index(drop=True)
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(store_path, index=False)
+    logging.info(f"Saved {len(df)} rows for {df['Contest'].nunique()} contests to {store_path}")
+    return df
 
 # ------------------ MAIN ------------------ #
 if __name__ == "__main__":
-    contest_code = "START202D"
-    institution = "Sri Eshwar College of Engineering, Kinathukadavu"
-    
-    users_data, problem_columns = get_usernames_and_contest_data(contest_code, institution)
-    print_and_save_contest_data(users_data, contest_code, problem_columns)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch CodeChef contest rankings for one or more institutions.")
+    parser.add_argument("--contests", nargs="+", default=["START202D"],
+                        help="contest codes or ranges such as START200D..START212D")
+    parser.add_argument("--institutions", nargs="+", default=["Sri Eshwar College of Engineering, Kinathukadavu"])
+    parser.add_argument("--workers", type=int, default=2, help="contests fetched in parallel (one Chrome session each)")
+    parser.add_argument("--store", default=None,
+                        help="Parquet store for batch results (default: contest_results.parquet when batching)")
+    parser.add_argument("--report", default="contest_report.json", help="JSON run report with per-stage timings")
+    parser.add_argument("--metrics", default=None, help="also write the run's metrics in Prometheus text format")
+    args = parser.parse_args()
+
+    run = start_run("contest")
+
+    contest_codes = expand_contest_codes(args.contests)
+    if len(contest_codes) == 1 and len(args.institutions) == 1 and not args.store:
+        users_data, problem_columns = get_usernames_and_contest_data(contest_codes[0], args.institutions[0])
+        print_and_save_contest_data(users_data, contest_codes[0], problem_columns)
+    else:
+        with DriverPool(size=args.workers) as pool:
+            df = fetch_contest_batch(contest_codes, args.institutions, workers=args.workers, pool=pool)
+        if df.empty:
+            print("No users found for any contest")
+        else:
+            save_contest_store(df, args.store or "contest_results.parquet")
+            print(f"\n✅ Stored {len(df)} rows for {df['Contest'].nunique()} contests and {df['Institution'].nunique()} institutions")
+    run.write_report(args.report)
+    if args.metrics:
+        run.write_prometheus(args.metrics)
+    print(f"✅ {run.summary()}")
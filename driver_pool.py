@@ -0,0 +1,132 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+
+def chrome_options(headless=True, user_agent=USER_AGENT, extra_args=()):
+    """The headless Chrome flags every scraper in this repo was building by hand."""
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if user_agent:
+        options.add_argument(f"--user-agent={user_agent}")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--log-level=3")
+    for arg in extra_args:
+        options.add_argument(arg)
+    return options
+
+def create_driver(headless=True, user_agent=USER_AGENT, extra_args=()):
+    return webdriver.Chrome(options=chrome_options(headless, user_agent, extra_args))
+
+class DriverPool:
+    """Keeps up to `size` warm Chrome sessions and hands them out to scraping threads.
+
+    A driver is health-checked before every lease and replaced if it no longer responds,
+    and it is recycled (quit and re-created on demand) after `max_pages` page loads so
+    long runs do not accumulate Chrome memory. The pool is thread-safe, so several
+    contests or institutions can be scraped in parallel sessions by sharing one pool.
+    """
+
+    def __init__(self, size=2, max_pages=50, factory=create_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.factory = factory
+        self.idle = queue.LifoQueue()
+        self.pages = {}
+        self.created = 0
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+        self.closed = False
+
+    def is_healthy(self, driver):
+        try:
+            driver.execute_script("return document.readyState")
+            return True
+        except Exception as e:
+            logging.warning(f"Discarding unresponsive Chrome session: {e}")
+            return False
+
+    def discard(self, driver):
+        with self.lock:
+            self.pages.pop(id(driver), None)
+            self.created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        if self.closed:
+            raise RuntimeError("DriverPool is closed")
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError("No Chrome session became available")
+        try:
+            while True:
+                try:
+                    driver = self.idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self.is_healthy(driver):
+                    return driver
+                self.discard(driver)
+            driver = self.factory()
+            with self.lock:
+                self.created += 1
+                self.pages[id(driver)] = 0
+            logging.info(f"Started Chrome session {self.created}/{self.size}")
+            return driver
+        except Exception:
+            self.slots.release()
+            raise
+
+    def record_page(self, driver, count=1):
+        with self.lock:
+            self.pages[id(driver)] = self.pages.get(id(driver), 0) + count
+
+    def release(self, driver, broken=False):
+        with self.lock:
+            pages = self.pages.get(id(driver), 0)
+        try:
+            if broken or self.closed or pages >= self.max_pages:
+                if pages >= self.max_pages:
+                    logging.info(f"Recycling Chrome session after {pages} pages")
+                self.discard(driver)
+            else:
+                self.idle.put(driver)
+        finally:
+            self.slots.release()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = not self.is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, broken)
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,103 @@
+import argparse
+import datetime
+import gzip
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from build_leaderboard import load_tables, read_manifest, source_hash, write_json
+from storage import PROFILE_COLUMNS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Splits the profile workbook into gzip-compressed JSON for index.html and userdata.html,
+# so the pages no longer download and parse the whole .xlsx with SheetJS. Layout:
+#   manifest.json                  source hash, shard count, columns and files per sheet
+#   <Sheet>/shard-NNN.json.gz      {"columns": [...], "rows": [[...], ...]} for the users in shard NNN
+# A row goes to shard fnv1a32(trimmed username, UTF-8) % shards, the same function the pages
+# use, so a single-user view fetches one shard per sheet. Values are strings or null, as the
+# pages' cleaning code expects. Every shard file exists, even when it has no rows.
+
+EXPORT_VERSION = 1  # bump when the output layout changes to force a rebuild
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+def fnv1a32(text):
+    h = FNV_OFFSET
+    for byte in text.encode("utf-8"):
+        h = ((h ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+def shard_of(username, shards):
+    return fnv1a32(str(username).strip()) % shards
+
+def sheet_rows(df, columns):
+    """Rows as lists of strings, None for empty cells."""
+    df = df.reindex(columns=columns).astype("string")
+    return [[None if pd.isna(v) else v for v in row] for row in df.itertuples(index=False, name=None)]
+
+def write_gzip_json(path, payload):
+    """Write atomically; mtime=0 keeps the bytes identical for identical content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    tmp.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    tmp.replace(path)
+
+def export(source="codechefprofiles.xlsx", out_dir="profile_shards", shards=16, force=False):
+    """Rewrite the per-sheet shards when `source` changed. Returns the manifest."""
+    out_dir = Path(out_dir)
+    digest = source_hash(source)
+    manifest = read_manifest(out_dir)
+    if (not force and manifest and manifest.get("source_hash") == digest and manifest.get("shards") == shards
+            and manifest.get("version") == EXPORT_VERSION):
+        logging.info(f"Profile shards in {out_dir} are up to date with {source} ({digest})")
+        return manifest
+
+    tables = load_tables(source)
+    sheets = {}
+    for sheet, columns in PROFILE_COLUMNS.items():
+        rows = sheet_rows(tables[sheet], columns)
+        buckets = [[] for _ in range(shards)]
+        for row in rows:
+            if row[0] is not None and row[0].strip():
+                buckets[shard_of(row[0], shards)].append(row)
+        files = []
+        for shard, bucket in enumerate(buckets):
+            name = f"{sheet}/shard-{shard:03d}.json.gz"
+            write_gzip_json(out_dir / name, {"columns": columns, "rows": bucket})
+            files.append(name)
+        for stale in (out_dir / sheet).glob("shard-*.json.gz"):
+            if f"{sheet}/{stale.name}" not in files:
+                stale.unlink()
+        sheets[sheet] = {"columns": columns, "rows": sum(len(b) for b in buckets), "files": files}
+
+    manifest = {
+        "version": EXPORT_VERSION,
+        "source": str(source),
+        "source_hash": digest,
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "hash": "fnv1a32",
+        "shards": shards,
+        "encoding": "gzip",
+        "sheets": sheets,
+    }
+    write_json(out_dir / "manifest.json", manifest)  # written last: it switches readers to the new files
+    logging.info(f"Exported {len(sheets)} sheets in {shards} shards to {out_dir}")
+    return manifest
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split the profile workbook into gzip JSON shards for the dashboards.")
+    parser.add_argument("source", nargs="?", default="codechefprofiles.xlsx", help="profile workbook or Parquet table directory")
+    parser.add_argument("-o", "--out-dir", default="profile_shards")
+    parser.add_argument("--shards", type=int, default=16, help="shards per sheet, by username hash")
+    parser.add_argument("--force", action="store_true", help="rewrite even if the source is unchanged")
+    args = parser.parse_args()
+
+    manifest = export(args.source, args.out_dir, args.shards, args.force)
+    rows = ", ".join(f"{sheet} {info['rows']}" for sheet, info in manifest["sheets"].items())
+    print(f"✅ {manifest['shards']} shards per sheet ({rows}), source {manifest['source_hash']}")
@@ -0,0 +1,90 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from timeparse import parse_last_ac_column
+
+NUMBER_PATTERN = r"([-+]?\d+(?:\.\d+)?)"
+
+def distinct_numbers(series):
+    """Factorize a column and extract the first number of each distinct value.
+
+    Ranking columns repeat a handful of values ("100", "-", ...), so the regex runs once
+    per distinct value; callers broadcast back through `codes` (-1 marks missing cells).
+    Returns (codes, distinct values as strings, numbers).
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    text = pd.Series(uniques.astype(object), dtype=object).astype("string")
+    numbers = pd.to_numeric(text.str.extract(NUMBER_PATTERN, expand=False), errors="coerce").to_numpy(dtype=float)
+    return codes, text, numbers
+
+def extract_numbers(series):
+    """First number in each cell as float, NaN if none."""
+    codes, _, numbers = distinct_numbers(series)
+    return pd.Series(np.append(numbers, np.nan)[codes], index=series.index)
+
+def problem_columns(columns):
+    """Problem score columns of a ranking table (P1..P8), or [] if it has none."""
+    problem_cols = [c for c in columns if re.match(r"^P\d+$", c.strip(), re.I)]
+    if not problem_cols:
+        problem_cols = [c for c in columns if "P" in c and any(ch.isdigit() for ch in c)]
+    return problem_cols
+
+def build_features(df):
+    """Featurize a contest ranking table column-at-a-time. Returns (df, problem_cols)."""
+    df = df.copy()
+    df.columns = [c.strip() for c in df.columns]
+
+    # Identify problem columns (P1..P8)
+    problem_cols = problem_columns(df.columns)
+
+    # Parse problem scores; "-" (or empty) means not attempted and scores 0
+    for pc in problem_cols:
+        codes, text, numbers = distinct_numbers(df[pc])
+        numbers[text.str.strip().eq("-").to_numpy(dtype=bool)] = 0.0
+        df[pc + "_score"] = np.append(numbers, 0.0)[codes]  # missing cells count as "-"
+
+    # Parse Rank
+    rank_col = next((c for c in df.columns if "rank" in c.lower()), None)
+    if rank_col and pd.api.types.is_integer_dtype(df[rank_col]):
+        df["Rank_num"] = df[rank_col].astype(np.int64)
+    elif rank_col:
+        text = df[rank_col].astype(object).where(df[rank_col].notna()).astype("string")
+        ranks = pd.to_numeric(text.str.extract(r"(\d+)", expand=False), errors="coerce")
+        df["Rank_num"] = ranks.astype(float) if ranks.isna().any() else ranks.astype(np.int64)
+    else:
+        df["Rank_num"] = np.arange(1, len(df) + 1)  # fallback fake rank if missing
+
+    score_cols = [pc + "_score" for pc in problem_cols]
+    scores = df[score_cols].to_numpy(dtype=float)
+    attempted = (scores > 0).sum(axis=1)
+
+    # Parse Total Score
+    total_col = next((c for c in df.columns if "total" in c.lower() and "score" in c.lower()), None)
+    if total_col:
+        df["TotalScore_num"] = extract_numbers(df[total_col])
+    else:
+        df["TotalScore_num"] = df[score_cols].sum(axis=1)
+
+    # Parse Problems Solved
+    if "Problems Solved" in df.columns:
+        df["Problems Solved"] = df["Problems Solved"].fillna(0).astype(int)
+    else:
+        df["Problems Solved"] = attempted
+
+    # Parse Last AC
+    last_ac_col = next((c for c in df.columns if "last" in c.lower() and "ac" in c.lower()), None)
+    if last_ac_col:
+        df["LastAC_days"] = parse_last_ac_column(df[last_ac_col])
+    else:
+        df["LastAC_days"] = -1
+
+    # Add engineered features
+    df["num_attempted"] = attempted.astype(int)
+    df["avg_problem_score"] = df[score_cols].mean(axis=1)
+    df["max_problem_score"] = df[score_cols].max(axis=1)
+    df["std_problem_score"] = df[score_cols].std(axis=1).fillna(0)
+
+    # Clean
+    return df.fillna(-1), problem_cols
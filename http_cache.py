@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# On-disk HTTP response cache for the scraper's GET requests.
+#   fresh entry (younger than ttl)      -> served from disk, no request at all
+#   stale entry with ETag/Last-Modified -> conditional GET; a 304 re-serves the stored body
+#   otherwise                           -> normal GET, stored if it succeeded
+# Every body is stored with its SHA-256, which also keys a table of parse results, so a
+# page that comes back byte-identical is not parsed again.
+
+class HttpCache:
+    """SQLite-backed response store with TTL, LRU size eviction and hit/miss counters."""
+
+    def __init__(self, path="http_cache.sqlite3", ttl_seconds=6 * 3600, max_bytes=256 * 1024 * 1024,
+                 max_age_seconds=30 * 86400):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_age = max_age_seconds  # entries unused for longer than this are dropped outright
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "revalidated": 0, "misses": 0, "parse_skipped": 0, "evicted": 0}
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " stored_at REAL NOT NULL,"
+            " used_at REAL NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " content_hash TEXT NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS parsed (content_hash TEXT PRIMARY KEY, result TEXT NOT NULL)")
+        self.conn.commit()
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def lookup(self, url):
+        """(stored_at, headers, body, etag, last_modified, content_hash) or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT stored_at, headers, body, etag, last_modified, content_hash FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row:
+                self.conn.execute("UPDATE responses SET used_at = ? WHERE url = ?", (time.time(), url))
+                self.conn.commit()
+        if row is None:
+            return None
+        return (row[0], json.loads(row[1]), *row[2:])
+
+    def store(self, url, headers, body):
+        content_hash = hashlib.sha256(body).hexdigest()
+        # The body is stored decoded, so transfer-level headers no longer apply to it
+        headers = CaseInsensitiveDict({k: v for k, v in headers.items()
+                                       if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")})
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, now, now, json.dumps(dict(headers)), body, headers.get("ETag"), headers.get("Last-Modified"),
+                 content_hash, len(body)),
+            )
+            self.conn.commit()
+        return content_hash
+
+    def is_fresh(self, url):
+        with self.lock:
+            row = self.conn.execute("SELECT stored_at FROM responses WHERE url = ?", (url,)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def touch(self, url):
+        """A 304 confirmed the stored body; it is fresh again for another ttl."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE responses SET stored_at = ?, used_at = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+
+    def parsed(self, content_hash, parse):
+        """parse() for a body seen for the first time; the stored result for a byte-identical body."""
+        with self.lock:
+            row = self.conn.execute("SELECT result FROM parsed WHERE content_hash = ?", (content_hash,)).fetchone()
+        if row is not None:
+            self.count("parse_skipped")
+            return json.loads(row[0])
+        result = parse()
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO parsed VALUES (?, ?)", (content_hash, json.dumps(result)))
+            self.conn.commit()
+        return result
+
+    def evict(self):
+        """Drop entries unused for max_age, then the least recently used until under max_bytes."""
+        with self.lock:
+            removed = self.conn.execute("DELETE FROM responses WHERE used_at < ?", (time.time() - self.max_age,)).rowcount
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY used_at").fetchall():
+                    self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    removed += 1
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self.conn.execute("DELETE FROM parsed WHERE content_hash NOT IN (SELECT content_hash FROM responses)")
+            self.conn.commit()
+            self.counters["evicted"] += removed
+        return removed
+
+    def summary(self):
+        c = self.counters
+        requests_seen = c["hits"] + c["revalidated"] + c["misses"]
+        saved = c["hits"] + c["revalidated"]
+        return (f"HTTP cache: {c['hits']} hits, {c['revalidated']} revalidated (304), {c['misses']} misses"
+                f" ({saved}/{requests_seen} served from cache), {c['parse_skipped']} unchanged pages not re-parsed")
+
+    def close(self):
+        removed = self.evict()
+        if removed:
+            logging.info(f"Evicted {removed} cached responses from {self.path}")
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def cached_response(url, headers, body, content_hash):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = body
+    response.from_cache = True
+    response.content_hash = content_hash
+    return response
+
+class CachedSession:
+    """Wraps a requests.Session: GETs of URLs matching `include` go through an HttpCache.
+
+    Other methods and URLs are passed straight to the wrapped session. Responses carry
+    `from_cache` and `content_hash` attributes for use with HttpCache.parsed().
+    """
+
+    def __init__(self, session, cache, include=r"/users/[^/?]+$"):
+        self.session = session
+        self.cache = cache
+        self.include = re.compile(include) if include else None
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def get(self, url, headers=None, **kwargs):
+        if self.include and not self.include.search(url):
+            return self.session.get(url, headers=headers, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry is not None:
+            stored_at, stored_headers, body, etag, last_modified, content_hash = entry
+            if time.time() - stored_at < self.cache.ttl:
+                self.cache.count("hits")
+                return cached_response(url, stored_headers, body, content_hash)
+            conditional = dict(headers or {})
+            if etag:
+                conditional["If-None-Match"] = etag
+            if last_modified:
+                conditional["If-Modified-Since"] = last_modified
+            if etag or last_modified:
+                response = self.session.get(url, headers=conditional, **kwargs)
+                if response.status_code == 304:
+                    self.cache.touch(url)
+                    self.cache.count("revalidated")
+                    return cached_response(url, stored_headers, body, content_hash)
+                return self.remember(url, response)
+
+        return self.remember(url, self.session.get(url, headers=headers, **kwargs))
+
+    def remember(self, url, response):
+        self.cache.count("misses")
+        response.from_cache = False
+        response.content_hash = None
+        if response.status_code == 200:
+            response.content_hash = self.cache.store(url, response.headers, response.content)
+        return response
@@ -0,0 +1,106 @@
+import logging
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from itertools import takewhile
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import instrumentation
+
+# One requests.Session per scrape, shared by every worker thread.
+#   HTTPAdapter   keep-alive connection pool per host, sized to the number of threads that
+#                 use it at once, so connections are reused instead of re-opened per request
+#   BackoffRetry  failed GETs (connection errors, 429 and 5xx) are retried inside the
+#                 adapter with jittered exponential backoff; a Retry-After header on a
+#                 429/503 is obeyed instead
+#   RequestStats  response hook recording per-host latency, status codes and retries
+#                 (retries, backoff time and request counts also go to instrumentation)
+# Callers make one session.get() and check the status: whatever comes back has already
+# been retried. Retries do not go through a HostRateLimiter; the backoff spaces them out.
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class BackoffRetry(Retry):
+    """urllib3 Retry that also waits before the first retry (stock Retry retries at once)."""
+
+    def get_backoff_time(self):
+        consecutive = len(list(takewhile(lambda h: h.redirect_location is None, reversed(self.history))))
+        if consecutive == 0:
+            return 0
+        backoff = self.backoff_factor * 2 ** (consecutive - 1) + random.random() * self.backoff_jitter
+        return max(0, min(self.backoff_max, backoff))
+
+    def sleep(self, response=None):
+        started = time.perf_counter()
+        super().sleep(response)
+        instrumentation.add_time("backoff", time.perf_counter() - started)
+        instrumentation.count("retries")
+
+def make_retry(max_retries=3, backoff_factor=2.0, backoff_jitter=3.0, backoff_max=60.0):
+    """`max_retries` attempts in all, counted the way the old hand-written loops did."""
+    return BackoffRetry(
+        total=max(max_retries - 1, 0),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        backoff_max=backoff_max,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand back the last 429/5xx; the caller logs it and moves on
+    )
+
+class RequestStats:
+    """Per-host request count, latency, status codes and retries, fed by a response hook."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def record(self, response, *args, **kwargs):
+        host = urllib.parse.urlsplit(response.url).netloc
+        seconds = response.elapsed.total_seconds()  # includes any retries and backoff
+        retries = getattr(response.raw, "retries", None)
+        with self.lock:
+            entry = self.hosts.setdefault(host, {"requests": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                 "retries": 0, "statuses": Counter()})
+            entry["requests"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            entry["retries"] += len(retries.history) if retries is not None else 0
+            entry["statuses"][response.status_code] += 1
+        instrumentation.count("http_requests")
+        logging.debug(f"GET {response.url} -> {response.status_code} in {seconds * 1000:.0f} ms")
+
+    def summary(self):
+        with self.lock:
+            lines = [
+                f"{host}: {e['requests']} requests, avg {e['seconds'] / e['requests'] * 1000:.0f} ms,"
+                f" max {e['max_seconds'] * 1000:.0f} ms, {e['retries']} retries,"
+                f" statuses {dict(sorted(e['statuses'].items()))}"
+                for host, e in self.hosts.items()
+            ]
+        return "HTTP: " + ("; ".join(lines) if lines else "no requests")
+
+def create_session(workers=4, max_retries=3, headers=None, backoff_factor=2.0, backoff_jitter=3.0,
+                   backoff_max=60.0, stats=None):
+    """requests.Session for `workers` scraper threads, with pooled keep-alive connections and retries.
+
+    The pool holds 2 * workers connections per host: the profile and the submissions
+    request of each worker can be in flight together. The session's RequestStats is
+    available as `session.stats`.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=2 * workers,
+                          max_retries=make_retry(max_retries, backoff_factor, backoff_jitter, backoff_max))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    session.stats = stats or RequestStats()
+    session.hooks["response"].append(session.stats.record)
+    return session
@@ -0,0 +1,226 @@
+import argparse
+import gzip
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from features import build_features, problem_columns
+from predict import model_features, min_problems_threshold
+from storage import read_table, write_table
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class ModelService:
+    """Loads the rank regressor and solved classifier once and scores whole frames at a time."""
+
+    def __init__(self, reg_path="rank_regressor.joblib", clf_path="solved_classifier.joblib", features=model_features):
+        start = time.perf_counter()
+        self.reg = joblib.load(reg_path)
+        self.clf = joblib.load(clf_path)
+        self.features = list(features)
+        self.lock = threading.Lock()
+        self.rows = 0
+        self.batches = 0
+        self.seconds = 0.0
+        logging.info(f"Loaded {reg_path} and {clf_path} in {time.perf_counter() - start:.2f}s")
+
+    def prepare(self, df):
+        """Accept either ready-made feature columns or a raw contest ranking table.
+
+        Raises ValueError naming the missing feature columns when `df` is neither, rather
+        than scoring default feature values.
+        """
+        if all(f in df.columns for f in self.features):
+            return df
+        if problem_columns([str(c) for c in df.columns]):
+            return build_features(df)[0]
+        missing = [f for f in self.features if f not in df.columns]
+        raise ValueError(f"Missing feature columns {missing} (or send a contest ranking with P1..Pn columns)")
+
+    def predict_frame(self, df):
+        df = self.prepare(df)
+        X = df[self.features].to_numpy(dtype=float)
+        start = time.perf_counter()
+        rank_pred = self.reg.predict(X)
+        class_pred = self.clf.predict(X)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.rows += len(X)
+            self.batches += 1
+            self.seconds += elapsed
+
+        out = pd.DataFrame(index=df.index)
+        if "Username" in df.columns:
+            out["Username"] = df["Username"]
+        out["Predicted Rank"] = rank_pred
+        out[f"Predicted >={min_problems_threshold} Solved"] = class_pred.astype(int)
+        return out
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "rows": self.rows,
+                "batches": self.batches,
+                "predict_seconds": round(self.seconds, 6),
+                "rows_per_second": round(self.rows / self.seconds, 1) if self.seconds else 0.0,
+                "avg_batch_rows": round(self.rows / self.batches, 1) if self.batches else 0.0,
+            }
+
+class MicroBatcher:
+    """Coalesces concurrent small requests into single vectorized predict calls.
+
+    Requests wait at most `max_wait_ms` for others to join; a batch is flushed early once
+    it reaches `max_batch_rows`. Submit prepared frames (ModelService.prepare) so bad input
+    fails before batching; if a batch still fails, its requests are retried one at a time
+    and only the failing ones get the error.
+    """
+
+    def __init__(self, service, max_batch_rows=4096, max_wait_ms=10):
+        self.service = service
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+    def submit(self, df):
+        future = Future()
+        self.requests.put((df, future))
+        return future
+
+    def run(self):
+        while True:
+            batch = [self.requests.get()]
+            rows = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            self.flush(batch)
+
+    def flush(self, batch):
+        try:
+            combined = pd.concat([self.service.prepare(df) for df, _ in batch], ignore_index=True)
+            result = self.service.predict_frame(combined)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            logging.warning(f"Batch of {len(batch)} requests failed ({e}); retrying them one at a time")
+            for item in batch:
+                self.flush([item])
+            return
+        offset = 0
+        for df, future in batch:
+            future.set_result(result.iloc[offset:offset + len(df)].reset_index(drop=True))
+            offset += len(df)
+
+def make_handler(batcher):
+    class PredictHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logging.debug("inference: " + format % args)
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                encoding = "gzip"
+            else:
+                encoding = None
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                return self.send_json(200, batcher.service.metrics())
+            self.send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                return self.send_json(404, {"error": "not found"})
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"[]")
+                rows = payload.get("rows", []) if isinstance(payload, dict) else payload
+                df = pd.DataFrame(rows)
+                if df.empty:
+                    return self.send_json(400, {"error": "no rows"})
+                # Validated here, so a bad request fails on its own instead of inside a batch
+                df = batcher.service.prepare(df)
+                result = batcher.submit(df).result(timeout=60)
+            except Exception as e:
+                return self.send_json(400, {"error": str(e)})
+            self.send_json(200, {"predictions": json.loads(result.to_json(orient="records"))})
+
+    return PredictHandler
+
+def load_batch(path):
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return pd.DataFrame(payload.get("rows", []) if isinstance(payload, dict) else payload)
+    return read_table(path)
+
+def score_file(service, input_path, output_path=None, batch_rows=100_000):
+    start = time.perf_counter()
+    df = load_batch(input_path)
+    load_s = time.perf_counter() - start
+    parts = [service.predict_frame(df.iloc[i:i + batch_rows]) for i in range(0, len(df), batch_rows)]
+    result = pd.concat(parts) if parts else pd.DataFrame()
+    total_s = time.perf_counter() - start
+    if output_path:
+        write_table(result, output_path)
+        logging.info(f"Predictions written to {output_path}")
+    metrics = service.metrics()
+    print(f"✅ Scored {len(df)} rows in {total_s:.3f}s (load {load_s:.3f}s, "
+          f"predict {metrics['predict_seconds']:.3f}s, {metrics['rows_per_second']:.0f} rows/s)")
+    return result
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch predictions with the trained rank regressor and solved classifier.")
+    parser.add_argument("input", nargs="?", help="CSV/Parquet/Feather/xlsx/JSON with feature columns or a raw contest ranking")
+    parser.add_argument("-o", "--output", help="where to write predictions (format from the suffix)")
+    parser.add_argument("--reg", default="rank_regressor.joblib")
+    parser.add_argument("--clf", default="solved_classifier.joblib")
+    parser.add_argument("--serve", action="store_true", help="serve POST /predict and GET /metrics instead")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--max-batch-rows", type=int, default=4096)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    service = ModelService(args.reg, args.clf)
+    if args.serve:
+        batcher = MicroBatcher(service, args.max_batch_rows, args.max_wait_ms)
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(batcher))
+        print(f"✅ Serving predictions on http://127.0.0.1:{args.port}/predict")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.input:
+        result = score_file(service, args.input, args.output)
+        if not args.output:
+            print(result.head(20).to_string(index=False))
+    else:
+        parser.error("an input file or --serve is required")
@@ -0,0 +1,138 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Timings and counters for one scrape run, shared by every thread of the process.
+#   with stage("fetch"): ...        wall time of one occurrence of a stage
+#   add_time("backoff", seconds)    time measured elsewhere (rate-limit waits, retry sleeps)
+#   count("rows", n)                event counters; the report also gives each as a rate per second
+#   start_run("app")                resets everything at the start of a run
+#   current_run().write_report(path) / .write_prometheus(path)
+# Stage seconds are summed over threads, so with 4 workers "fetch" can exceed the run time.
+# Stages nest where noted, so they do not add up to a total either.
+# Stages used by the scrapers:
+#   listing          institution listing (JSON API or Selenium); contains its fetch/parse
+#   fetch            HTTP GETs and Selenium page loads; an HTTP fetch contains its backoff
+#   rate_limit_wait  time blocked on the HostRateLimiter
+#   backoff          sleeps between retries of a failed request
+#   settle_wait      waiting for a Selenium page to settle (waits.wait_until_settled)
+#   page_delay       AdaptiveDelay pause between Selenium pages, following server response times
+#   snapshot         reading the ranking table out of the live DOM (contest.py)
+#   parse            HTML/JSON to rows
+#   persist          checkpoint, Parquet, Excel and dashboard writes
+
+class RunMetrics:
+    """Thread-safe stage timers and counters of one run."""
+
+    def __init__(self, name="run"):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.stages = {}  # name -> [calls, seconds, max_seconds]
+        self.counters = {}
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            entry = self.stages.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        duration = time.perf_counter() - self.started
+        with self.lock:
+            stages = {name: list(entry) for name, entry in self.stages.items()}
+            counters = dict(self.counters)
+        return {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_seconds": round(duration, 3),
+            "stages": {
+                name: {"calls": calls, "seconds": round(seconds, 3), "avg_ms": round(seconds / calls * 1000, 2),
+                       "max_ms": round(max_seconds * 1000, 2)}
+                for name, (calls, seconds, max_seconds) in sorted(stages.items(), key=lambda item: -item[1][1])
+            },
+            "counters": counters,
+            "rates_per_second": {name: round(value / duration, 3) for name, value in counters.items()} if duration else {},
+        }
+
+    def summary(self):
+        report = self.report()
+        stages = ", ".join(f"{name} {s['seconds']:.1f} s" for name, s in list(report["stages"].items())[:5])
+        rows = report["counters"].get("rows", 0)
+        return (f"Run {self.name}: {report['duration_seconds']:.1f} s, {rows} rows"
+                f" ({report['rates_per_second'].get('rows', 0):.1f} rows/s); {stages or 'no stages recorded'}")
+
+    def write_report(self, path):
+        """JSON run report, written atomically. Returns the report."""
+        report = self.report()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        tmp.replace(path)
+        logging.info(f"Run report written to {path}")
+        return report
+
+    def write_prometheus(self, path):
+        """The same numbers in the Prometheus text format (for node_exporter's textfile collector)."""
+        report = self.report()
+        run = self.name.replace('"', "")
+        lines = [
+            "# HELP scrape_duration_seconds Wall time of the last scrape run.",
+            "# TYPE scrape_duration_seconds gauge",
+            f'scrape_duration_seconds{{run="{run}"}} {report["duration_seconds"]}',
+            "# HELP scrape_stage_seconds_total Time spent per stage, summed over threads.",
+            "# TYPE scrape_stage_seconds_total counter",
+        ]
+        lines += [f'scrape_stage_seconds_total{{run="{run}",stage="{name}"}} {s["seconds"]}'
+                  for name, s in report["stages"].items()]
+        lines += ["# HELP scrape_stage_calls_total Occurrences of each stage.", "# TYPE scrape_stage_calls_total counter"]
+        lines += [f'scrape_stage_calls_total{{run="{run}",stage="{name}"}} {s["calls"]}'
+                  for name, s in report["stages"].items()]
+        lines += ["# HELP scrape_events_total Run counters (requests, retries, rows, ...).", "# TYPE scrape_events_total counter"]
+        lines += [f'scrape_events_total{{run="{run}",event="{name}"}} {value}'
+                  for name, value in sorted(report["counters"].items())]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(path)
+        logging.info(f"Prometheus metrics written to {path}")
+
+active_run = RunMetrics()
+
+def start_run(name):
+    """Start recording a new run; earlier numbers are dropped."""
+    global active_run
+    active_run = RunMetrics(name)
+    return active_run
+
+def current_run():
+    return active_run
+
+def stage(name):
+    return active_run.stage(name)
+
+def add_time(name, seconds):
+    active_run.add_time(name, seconds)
+
+def count(name, n=1):
+    active_run.count(name, n)
@@ -1,21 +1,17 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
+from driver_pool import chrome_options as build_chrome_options
+from waits import PageSettled, install_watch, wait_for_attribute
 
 def setup_driver(headless=False):
-    chrome_options = Options()
+    extra_args = ["--start-maximized", "--disable-extensions", "--disable-popup-blocking"]
     if headless:
-        chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-popup-blocking")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+        extra_args.insert(0, "--headless=new")
+    chrome_options = build_chrome_options(headless=False, user_agent=None, extra_args=extra_args)
     service = Service()
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
@@ -55,16 +51,12 @@ def wait_for_replay_finish(driver):
             print("No timeline dots found; replay may not have started.")
             return
 
-        last_dot = dots[-1]
-        max_wait = 120
-        elapsed = 0
-        while elapsed < max_wait:
-            style = last_dot.get_attribute("style") or ""
-            if "100%" in style or "left: 100%" in style:
-                break
-            time.sleep(0.5)
-            elapsed += 0.5
-        time.sleep(1)
+        # Woken by a MutationObserver on the dot's style instead of polling it every 0.5 s
+        if not wait_for_attribute(driver, dots[-1], "style", "100%", timeout=120):
+            print("Replay did not reach the end within 120 s")
+        # The editor applies the last edit after the dot arrives: wait for its lines to stop changing
+        install_watch(driver)
+        WebDriverWait(driver, 10, poll_frequency=0.1).until(PageSettled("div.cm-content div.cm-line", quiet_ms=300))
         print("Replay finished")
     except Exception as e:
         print("Error waiting for replay finish:", e)
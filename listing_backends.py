@@ -0,0 +1,234 @@
+import urllib.parse
+import re
+import time
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import requests.exceptions
+from bs4 import BeautifulSoup
+
+from http_client import create_session
+from instrumentation import add_time, count, stage
+from ranking_table import BODY_ROW_SELECTOR
+from waits import AdaptiveDelay, wait_until_settled
+
+BASE_URL = "https://www.codechef.com"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+
+# A "listing backend" turns an institution name into the usernames on its ratings listing.
+# Every backend exposes get_usernames(institution, max_pages_limit) -> sorted list of usernames.
+
+class ListingError(Exception):
+    """Raised when a backend cannot produce a listing and the caller should fall back."""
+
+class HttpListingBackend:
+    """Reads the JSON endpoint behind /ratings/all directly, no browser involved.
+
+    Page 1 is fetched first to learn how many pages exist; the remaining pages are then
+    fetched concurrently by `workers` threads (optionally sharing a HostRateLimiter).
+    Failed requests are retried by the session (http_client.create_session by default).
+    """
+
+    def __init__(self, session=None, headers=None, base_url=BASE_URL, items_per_page=50,
+                 workers=4, limiter=None, max_retries=3, timeout=10):
+        self.session = session or create_session(workers, max_retries)
+        self.headers = headers or {"User-Agent": USER_AGENT}
+        self.base_url = base_url
+        self.items_per_page = items_per_page
+        self.workers = workers
+        self.limiter = limiter
+        self.timeout = timeout
+
+    def page_url(self, institution, page):
+        institution_encoded = urllib.parse.quote(institution)
+        return (
+            f"{self.base_url}/api/ratings/all"
+            f"?filterBy=Institution%3D{institution_encoded}"
+            f"&itemsPerPage={self.items_per_page}&order=asc&page={page}&sortBy=global_rank"
+        )
+
+    def fetch_page(self, institution, page):
+        url = self.page_url(institution, page)
+        if self.limiter:
+            add_time("rate_limit_wait", self.limiter.acquire(url))
+        try:
+            with stage("fetch"):
+                response = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            if response.status_code == 200:
+                count("pages")
+                return response.json()
+            reason = f"Status {response.status_code}"
+        except (requests.exceptions.RequestException, ValueError) as e:
+            reason = e
+        raise ListingError(f"Listing page {page} for {institution} could not be fetched: {reason}")
+
+    @staticmethod
+    def usernames_from_payload(payload):
+        return [row["username"] for row in payload.get("list", []) if row.get("username")]
+
+    def page_count(self, payload):
+        if payload.get("availablePages"):
+            return int(payload["availablePages"])
+        total = payload.get("totalItems") or payload.get("total")
+        if total:
+            return -(-int(total) // self.items_per_page)
+        return 1
+
+    def get_usernames(self, institution, max_pages_limit=20):
+        first = self.fetch_page(institution, 1)
+        usernames = set(self.usernames_from_payload(first))
+        pages = min(self.page_count(first), max_pages_limit)
+        logging.info(f"Listing for {institution}: {pages} page(s), {len(usernames)} users on page 1")
+
+        if pages > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                payloads = pool.map(lambda p: self.fetch_page(institution, p), range(2, pages + 1))
+                for page, payload in enumerate(payloads, start=2):
+                    page_usernames = self.usernames_from_payload(payload)
+                    usernames.update(page_usernames)
+                    logging.info(f"Extracted {len(page_usernames)} users from page {page}. Total so far: {len(usernames)}")
+
+        return sorted(usernames)
+
+def parse_ratings_page(page_source):
+    """Extract usernames from a rendered /ratings/all page.
+
+    Returns (usernames, has_next). usernames is None when the page reports no results or
+    has no table at all.
+    """
+    soup = BeautifulSoup(page_source, "html.parser")
+    page_text = soup.get_text().lower()
+    if "no results" in page_text or "no users" in page_text or "0 results" in page_text:
+        return None, False
+
+    table = soup.find("table", class_=re.compile(r"MuiTable-root.*MUIDataTable-tableRoot")) or soup.find("table")
+    if not table:
+        logging.error(f"No table found. Page title: {soup.title.get_text() if soup.title else 'No title'}")
+        return None, False
+
+    page_usernames = set()
+    for row in table.find_all("tr")[1:]:
+        first_td = row.find("td", {"data-colindex": "0"})
+        if first_td:
+            link = first_td.find("a", href=re.compile(r"/users/"))
+            if link:
+                username_span = link.find("span", class_="m-username--link")
+                username = username_span.get_text(strip=True) if username_span else link.get("title", "")
+                if username:
+                    page_usernames.add(username)
+
+    next_button = soup.find("button", {"aria-label": re.compile(r"Go to next page", re.I)}) or \
+                  soup.find("button", string=re.compile(r"Next", re.I)) or \
+                  soup.find("button", class_=re.compile(r"MuiPaginationItem.*next"))
+    has_next = bool(next_button) and not ("disabled" in next_button.get("class", []) or next_button.get("disabled") or "false" in next_button.get("aria-disabled", ""))
+    return page_usernames, has_next
+
+class SeleniumListingBackend:
+    """Renders /ratings/all in headless Chrome page by page. Slow; kept as the fallback.
+
+    Pass a driver_pool.DriverPool to reuse a warm session instead of launching Chrome.
+    Each page is read once its rows have settled, and the pause between pages follows
+    the server's response times (waits.AdaptiveDelay) instead of a fixed 5-8 s.
+    """
+
+    def __init__(self, base_url=BASE_URL, max_retries=3, pool=None, delay=None):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.pool = pool
+        self.delay = delay or AdaptiveDelay(min_delay=2.0, max_delay=60.0)
+
+    def get_usernames(self, institution, max_pages_limit=20):
+        usernames = set()
+        institution_encoded = urllib.parse.quote(institution)
+        page = 1
+        if self.pool:
+            driver = self.pool.acquire()
+        else:
+            from driver_pool import create_driver
+            driver = create_driver()
+
+        try:
+            while page <= max_pages_limit:
+                url = (
+                    f"{self.base_url}/ratings/all"
+                    f"?filterBy=Institution%3D{institution_encoded}"
+                    f"&itemsPerPage=50&order=asc&page={page}&sortBy=global_rank"
+                )
+                logging.info(f"Fetching page {page}: {url}")
+
+                for attempt in range(self.max_retries):
+                    try:
+                        started = time.perf_counter()
+                        with stage("fetch"):
+                            driver.get(url)
+                            if self.pool:
+                                self.pool.record_page(driver)
+                        with stage("settle_wait"):
+                            state = wait_until_settled(driver, BODY_ROW_SELECTOR, timeout=30)
+                        server_ms = state.get("server_ms")
+                        self.delay.observe(server_ms / 1000 if server_ms else time.perf_counter() - started,
+                                           throttled=attempt > 0)
+                        break
+                    except Exception as e:
+                        logging.warning(f"Attempt {attempt + 1}/{self.max_retries} failed for page {page}: {e}")
+                        if attempt + 1 == self.max_retries:
+                            logging.error(f"Max retries reached for page {page}, skipping")
+                            return sorted(usernames)
+                        count("retries")
+                        with stage("backoff"):
+                            time.sleep(2 ** attempt + random.uniform(5.0, 8.0))
+
+                count("pages")
+                with stage("parse"):
+                    page_usernames, has_next = parse_ratings_page(driver.page_source)
+                if page_usernames is None:
+                    logging.info(f"No results found on page {page}")
+                    break
+                if not page_usernames:
+                    logging.warning(f"No data rows found on page {page}")
+                    break
+
+                new_users = len(page_usernames - usernames)
+                usernames.update(page_usernames)
+                logging.info(f"Extracted {len(page_usernames)} users from page {page} ({new_users} new). Total so far: {len(usernames)}")
+
+                if new_users == 0:
+                    logging.info(f"No new users on page {page}, stopping")
+                    break
+                if len(page_usernames) < 50 and page > 1:
+                    logging.info(f"Partial page {page} ({len(page_usernames)} users < 50), likely last page")
+                    break
+                if not has_next:
+                    logging.info("Next button disabled or not found - no more pages")
+                    break
+
+                page += 1
+                with stage("page_delay"):
+                    self.delay.wait()
+
+        except Exception as e:
+            logging.error(f"Error during extraction: {e}")
+        finally:
+            if self.pool:
+                self.pool.release(driver, broken=not self.pool.is_healthy(driver))
+            else:
+                driver.quit()
+
+        return sorted(usernames)
+
+def get_usernames(institution, max_pages_limit=20, backends=None):
+    """Try each backend in order (HTTP first, Selenium as fallback) until one returns users."""
+    backends = backends if backends is not None else [HttpListingBackend(), SeleniumListingBackend()]
+    for backend in backends:
+        name = type(backend).__name__
+        try:
+            usernames = backend.get_usernames(institution, max_pages_limit)
+        except Exception as e:
+            logging.warning(f"{name} failed for {institution}: {e}")
+            continue
+        if usernames:
+            logging.info(f"{name} returned {len(usernames)} users for {institution}")
+            return usernames
+        logging.warning(f"{name} returned no users for {institution}")
+    return []
@@ -1,9 +1,14 @@
-import pandas as pd
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import numpy as np
-import re
-import datetime
 import joblib
-from sklearn.model_selection import train_test_split, GridSearchCV
+from joblib import effective_n_jobs
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, GridSearchCV, ParameterGrid
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
@@ -11,99 +16,124 @@ from sklearn.metrics import (
     mean_absolute_error, mean_squared_error, r2_score,
     accuracy_score, f1_score, classification_report, confusion_matrix
 )
+from storage import read_table
+from features import build_features
 
 # ---------- CONFIG ----------
-excel_path = "codechef_START202D_contest_data.xlsx"  # change if needed
+excel_path = "codechef_START202D_contest_data.xlsx"  # change if needed (.parquet/.feather/.csv also accepted)
 random_state = 42
 min_problems_threshold = 4  # classifier threshold
+model_features = ["num_attempted", "avg_problem_score", "max_problem_score", "std_problem_score", "LastAC_days"]
+search_n_jobs = -1  # worker processes for the hyperparameter search (-1 = all cores)
+search_time_budget = 300  # seconds; no search round is started that would end after this
+search_cv_folds = 3
+search_cache_dir = ".sklearn_cache"  # CV scores per candidate, reused by later searches on the same data
+reg_param_grid = {
+    "rf__n_estimators": [100, 300],
+    "rf__max_depth": [None, 10, 20],
+    "rf__min_samples_leaf": [1, 2, 4],
+}
+clf_param_grid = {
+    "rf__n_estimators": [100, 300],
+    "rf__max_depth": [None, 10, 20],
+    "rf__min_samples_leaf": [1, 2, 4],
+    "rf__class_weight": [None, "balanced"],
+}
 # ----------------------------
 
-def safe_extract_number(s):
-    """Extract numeric part of a string safely."""
-    if pd.isnull(s): return np.nan
-    s = str(s)
-    m = re.search(r"[-+]?\d+(\.\d+)?", s)
-    return float(m.group(0)) if m else np.nan
-
-def parse_last_ac_to_days(s):
-    """Convert 'Last AC' text into days difference."""
-    if pd.isnull(s) or str(s).strip() in ["N/A", "-"]: return -1
-    s = str(s)
-    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%b %d, %Y", "%d %b %Y"):
-        try:
-            dt = datetime.datetime.strptime(s, fmt)
-            return (datetime.datetime.now() - dt).days
-        except: pass
-    if "day" in s:
-        m = re.search(r"(\d+)\s+day", s)
-        if m: return int(m.group(1))
-    if "hour" in s: return 0
-    return -1
-
 def load_and_preprocess(path):
-    df = pd.read_excel(path, engine="openpyxl")
+    df = read_table(path)
     df.columns = [c.strip() for c in df.columns]
     print(f"Detected columns: {list(df.columns)}")
 
-    # Identify problem columns (P1..P8)
-    problem_cols = [c for c in df.columns if re.match(r"^P\d+$", c.strip(), re.I)]
-    if not problem_cols:
-        problem_cols = [c for c in df.columns if "P" in c and any(ch.isdigit() for ch in c)]
-
-    # Parse problem scores
-    for pc in problem_cols:
-        df[pc + "_score"] = df[pc].fillna("-").map(lambda x: safe_extract_number(x) if str(x).strip() != "-" else 0.0)
-
-    # Parse Rank
-    def parse_rank(x):
-        if pd.isnull(x): return np.nan
-        m = re.search(r"\d+", str(x))
-        return int(m.group(0)) if m else np.nan
-
-    rank_col = next((c for c in df.columns if "rank" in c.lower()), None)
-    if rank_col:
-        df["Rank_num"] = df[rank_col].map(parse_rank)
-    else:
-        df["Rank_num"] = np.arange(1, len(df) + 1)  # fallback fake rank if missing
-
-    # Parse Total Score
-    total_col = next((c for c in df.columns if "total" in c.lower() and "score" in c.lower()), None)
-    if total_col:
-        df["TotalScore_num"] = df[total_col].map(safe_extract_number)
-    else:
-        df["TotalScore_num"] = df[[pc + "_score" for pc in problem_cols]].sum(axis=1)
-
-    # Parse Problems Solved
-    if "Problems Solved" in df.columns:
-        df["Problems Solved"] = df["Problems Solved"].fillna(0).astype(int)
-    else:
-        df["Problems Solved"] = df[[pc + "_score" for pc in problem_cols]].apply(lambda r: (r > 0).sum(), axis=1)
-
-    # Parse Last AC
-    last_ac_col = next((c for c in df.columns if "last" in c.lower() and "ac" in c.lower()), None)
-    if last_ac_col:
-        df["LastAC_days"] = df[last_ac_col].map(parse_last_ac_to_days)
-    else:
-        df["LastAC_days"] = -1
-
-    # Add engineered features
-    score_cols = [pc + "_score" for pc in problem_cols]
-    df["num_attempted"] = df[score_cols].apply(lambda r: int((r > 0).sum()), axis=1)
-    df["avg_problem_score"] = df[score_cols].mean(axis=1)
-    df["max_problem_score"] = df[score_cols].max(axis=1)
-    df["std_problem_score"] = df[score_cols].std(axis=1).fillna(0)
-
-    # Clean
-    df = df.fillna(-1)
+    df, problem_cols = build_features(df)
     df.to_csv("processed_features.csv", index=False)
     print("✅ Processed features saved to processed_features.csv")
     return df, problem_cols
 
-def build_and_evaluate_models(df):
+def make_pipelines():
+    """Fresh (regressor, classifier) pipelines."""
+    reg = Pipeline([
+        ("scaler", StandardScaler()),
+        ("rf", RandomForestRegressor(random_state=random_state))
+    ])
+    clf = Pipeline([
+        ("scaler", StandardScaler()),
+        ("rf", RandomForestClassifier(random_state=random_state))
+    ])
+    return reg, clf
+
+def data_hash(X, y):
+    digest = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+def score_path(cache_dir, pipeline, params, scoring, cv, data):
+    """Cache file of one candidate's CV score: keyed by pipeline, params, scoring, folds and data."""
+    key = hashlib.sha256(repr((repr(pipeline), sorted(params.items()), scoring, cv, data)).encode()).hexdigest()[:32]
+    return Path(cache_dir) / "cv_scores" / f"{key}.json"
+
+def budgeted_grid_search(pipeline, param_grid, X, y, scoring, deadline, n_jobs=-1, cv=3, cache_dir=None):
+    """GridSearchCV in rounds of `n_jobs` candidates, stopping before `deadline`.
+
+    Each round runs its candidates x folds in parallel worker processes. A round is not
+    started if the previous one, taken as the estimate, would end past `deadline`; the
+    first round always runs unless cached scores already give a result. With `cache_dir`,
+    each candidate's mean CV score is stored there, and candidates already scored on the
+    same data are not cross-validated again. The best parameters seen so far are refit on
+    all of X; if no candidate got a finite score, the pipeline's default parameters are.
+    Returns (fitted pipeline, params, score).
+    """
+    candidates = list(ParameterGrid(param_grid))
+    best_params, best_score = None, -np.inf
+    pending = []  # (params, cache file or None) still to cross-validate
+    data = data_hash(X, y) if cache_dir else None
+    for params in candidates:
+        path = score_path(cache_dir, pipeline, params, scoring, cv, data) if cache_dir else None
+        if path is not None and path.exists():
+            score = json.loads(path.read_text(encoding="utf-8"))["score"]
+            if score > best_score:
+                best_params, best_score = params, score
+        else:
+            pending.append((params, path))
+    if cache_dir and len(pending) < len(candidates):
+        print(f"♻ {len(candidates) - len(pending)}/{len(candidates)} candidates scored by an earlier search")
+
+    round_size = max(1, effective_n_jobs(n_jobs))
+    last_round = 0.0  # seconds the previous round took
+    for start in range(0, len(pending), round_size):
+        if (best_params is not None or start > 0) and time.monotonic() + last_round > deadline:
+            print(f"⏱ Time budget reached after {start}/{len(pending)} candidates")
+            break
+        round_start = time.monotonic()
+        batch = pending[start:start + round_size]
+        grid = [{k: [v] for k, v in params.items()} for params, _ in batch]
+        search = GridSearchCV(pipeline, grid, scoring=scoring, cv=cv, n_jobs=n_jobs, refit=False)
+        search.fit(X, y)
+        # One single-valued grid per candidate, so cv_results_ lists them in batch order
+        for (params, path), score in zip(batch, search.cv_results_["mean_test_score"]):
+            if path is not None and np.isfinite(score):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"params": repr(params), "score": float(score)}), encoding="utf-8")
+                tmp.replace(path)
+            if score > best_score:
+                best_params, best_score = params, score
+        last_round = time.monotonic() - round_start
+    if best_params is None:
+        # Every score was NaN (e.g. f1 with a single class in every fold)
+        print(f"⚠ No candidate got a valid {scoring} score; fitting the default parameters")
+        best_params, best_score = {}, np.nan
+    return clone(pipeline).set_params(**best_params).fit(X, y), best_params, best_score
+
+def build_and_evaluate_models(df, search=False, n_jobs=search_n_jobs, time_budget=search_time_budget):
     if "Rank_num" not in df.columns or "Problems Solved" not in df.columns:
         raise ValueError("Missing 'Rank_num' or 'Problems Solved' columns after preprocessing!")
 
-    features = ["num_attempted", "avg_problem_score", "max_problem_score", "std_problem_score", "LastAC_days"]
+    features = list(model_features)
     X = df[features].values
     y_rank = df["Rank_num"].astype(float).values
     y_class = (df["Problems Solved"] >= min_problems_threshold).astype(int)
@@ -112,23 +142,37 @@ def build_and_evaluate_models(df):
         X, y_rank, y_class, test_size=0.2, random_state=random_state
     )
 
+    # The regressor and the classifier are independent, so they are trained side by side
+    if search:
+        reg, clf = make_pipelines()
+        deadline = time.monotonic() + time_budget
+        # Each search gets half of the cores so the two do not oversubscribe the machine
+        jobs_each = max(1, effective_n_jobs(n_jobs) // 2)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reg_job = executor.submit(budgeted_grid_search, reg, reg_param_grid, X_train, y_rank_train,
+                                      "neg_mean_absolute_error", deadline, jobs_each, search_cv_folds,
+                                      search_cache_dir)
+            clf_job = executor.submit(budgeted_grid_search, clf, clf_param_grid, X_train, y_class_train,
+                                      "f1", deadline, jobs_each, search_cv_folds, search_cache_dir)
+            reg, reg_params, reg_score = reg_job.result()
+            clf, clf_params, clf_score = clf_job.result()
+        print(f"\n🔎 Best regressor params (CV MAE {-reg_score:.2f}): {reg_params}")
+        print(f"🔎 Best classifier params (CV F1 {clf_score:.3f}): {clf_params}")
+    else:
+        reg, clf = make_pipelines()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reg_job = executor.submit(reg.fit, X_train, y_rank_train)
+            clf_job = executor.submit(clf.fit, X_train, y_class_train)
+            reg_job.result()
+            clf_job.result()
+
     # --- Rank Regressor ---
-    reg = Pipeline([
-        ("scaler", StandardScaler()),
-        ("rf", RandomForestRegressor(random_state=random_state))
-    ])
-    reg.fit(X_train, y_rank_train)
     y_pred = reg.predict(X_test)
     print("\n=== Rank Regressor ===")
     print("MAE:", mean_absolute_error(y_rank_test, y_pred))
     print("R2:", r2_score(y_rank_test, y_pred))
 
     # --- Classifier ---
-    clf = Pipeline([
-        ("scaler", StandardScaler()),
-        ("rf", RandomForestClassifier(random_state=random_state))
-    ])
-    clf.fit(X_train, y_class_train)
     y_cpred = clf.predict(X_test)
     print("\n=== Problem Solved Classifier ===")
     print("Accuracy:", accuracy_score(y_class_test, y_cpred))
@@ -151,9 +195,17 @@ def predict_sample(reg_model, clf_model, features, sample):
     return rank_pred, class_pred
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the rank regressor and solved classifier.")
+    parser.add_argument("path", nargs="?", default=excel_path)
+    parser.add_argument("--search", action="store_true", help="cross-validated hyperparameter search")
+    parser.add_argument("--n-jobs", type=int, default=search_n_jobs)
+    parser.add_argument("--time-budget", type=float, default=search_time_budget,
+                        help="seconds for the search; a round that would end after it is not started")
+    args = parser.parse_args()
+
     print("Loading and preprocessing data...")
-    df, problem_cols = load_and_preprocess(excel_path)
-    reg_model, clf_model, feature_list = build_and_evaluate_models(df)
+    df, problem_cols = load_and_preprocess(args.path)
+    reg_model, clf_model, feature_list = build_and_evaluate_models(df, args.search, args.n_jobs, args.time_budget)
 
     # Demo Prediction
     demo_sample = df[feature_list].mean().to_dict()
@@ -0,0 +1,161 @@
+import logging
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional; SoupProfileParser needs only bs4 and the stdlib
+    etree = None
+
+BASE_URL = "https://www.codechef.com"
+
+# A "profile parser" turns a profile page and the submissions API HTML into the rows the
+# scraper stores. Every parser exposes
+#   parse_profile(html, handle)      -> (badges, ratings, ranks)
+#   parse_submissions(html, handle)  -> submissions
+# with the row layouts of storage.PROFILE_COLUMNS. Only the rating header, the ranks list
+# and the badges widget of a profile page are looked at; everything else is skipped.
+
+# Widgets read from a profile page. bs4 matches a multi-word class_ against the whole
+# attribute, so these are compared exactly; single words match any class token.
+BADGES_WIDGET = "widget badges"
+RATING_WIDGET = "rating-header text-center"
+RANKS_WIDGET = "rating-ranks"
+
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+class LxmlProfileParser:
+    """libxml2 parse plus XPath expressions compiled once per parser, one lookup per field."""
+
+    name = "lxml"
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError("lxml is not installed")
+        xpath = etree.XPath
+        self.badge_sections = xpath(f"//div[@class='{BADGES_WIDGET}']")
+        self.badges = xpath(f".//div[{has_class('badge')}]")
+        self.badge_title = xpath(f"(.//p[{has_class('badge__title')}])[1]")
+        self.badge_description = xpath(f"(.//p[{has_class('badge__description')}])[1]")
+        self.badge_image = xpath("(.//img)[1]/@src")
+        self.rating_section = xpath(f"(//div[@class='{RATING_WIDGET}'])[1]")
+        self.rating_number = xpath(f"(.//div[{has_class('rating-number')}])[1]")
+        self.first_span = xpath("(.//span)[1]")
+        self.first_small = xpath("(.//small)[1]")
+        self.rank_items = xpath(f"(//div[{has_class(RANKS_WIDGET)}])[1]//li")
+        self.first_strong = xpath("(.//strong)[1]")
+        self.table_rows = xpath("//tr")
+        self.cells = xpath(".//td")
+        self.first_link_href = xpath("(.//a)[1]/@href")
+
+    @staticmethod
+    def text(elements):
+        return elements[0].text_content().strip() if elements else "N/A"
+
+    @staticmethod
+    def document(html):
+        return lxml.html.document_fromstring(html) if html and html.strip() else None
+
+    def parse_profile(self, html, handle):
+        badges_data, ranks_data = [], []
+        ratings_data = [handle, "N/A", "N/A", "N/A"]
+        doc = self.document(html)
+        if doc is None:
+            return badges_data, ratings_data, ranks_data
+
+        for section in self.badge_sections(doc):
+            for badge in self.badges(section):
+                image = self.badge_image(badge)
+                badges_data.append([handle, self.text(self.badge_title(badge)), self.text(self.badge_description(badge)),
+                                    image[0] if image else "N/A"])
+
+        section = self.rating_section(doc)
+        if section:
+            ratings_data = [handle, self.text(self.rating_number(section[0])), self.text(self.first_span(section[0])),
+                            self.text(self.first_small(section[0]))]
+
+        for item in self.rank_items(doc):
+            rank = self.text(self.first_strong(item))
+            label = "".join(s.strip() for s in item.itertext()).replace(rank, "").strip()
+            ranks_data.append([handle, label, rank])
+        return badges_data, ratings_data, ranks_data
+
+    def parse_submissions(self, html, handle):
+        submissions_data = []
+        doc = self.document(html)
+        if doc is None:
+            return submissions_data
+        for row in self.table_rows(doc):
+            cols = self.cells(row)
+            if len(cols) == 5:
+                time_val, problem, result, language = (col.text_content().strip() for col in cols[:4])
+                href = self.first_link_href(cols[4])
+                solution_link = f"{BASE_URL}{href[0]}" if href else "N/A"
+                submissions_data.append([handle, time_val, problem, result, language, solution_link])
+        return submissions_data
+
+class SoupProfileParser:
+    """BeautifulSoup fallback: builds a tree of the three widgets only, one find per field."""
+
+    name = "soup"
+
+    def __init__(self, features="html.parser"):
+        self.features = features
+        self.profile_strainer = SoupStrainer("div", class_=[BADGES_WIDGET, RATING_WIDGET, RANKS_WIDGET])
+        self.rows_strainer = SoupStrainer("tr")
+
+    @staticmethod
+    def text(element):
+        return element.text.strip() if element else "N/A"
+
+    def parse_profile(self, html, handle):
+        soup = BeautifulSoup(html or "", self.features, parse_only=self.profile_strainer)
+        badges_data, ranks_data = [], []
+
+        for section in soup.find_all("div", class_=BADGES_WIDGET):
+            for badge in section.find_all("div", class_="badge"):
+                image = badge.find("img")
+                badges_data.append([handle, self.text(badge.find("p", class_="badge__title")),
+                                    self.text(badge.find("p", class_="badge__description")),
+                                    image["src"] if image and "src" in image.attrs else "N/A"])
+
+        section = soup.find("div", class_=RATING_WIDGET)
+        ratings_data = [handle, "N/A", "N/A", "N/A"]
+        if section:
+            ratings_data = [handle, self.text(section.find("div", class_="rating-number")),
+                            self.text(section.find("span")), self.text(section.find("small"))]
+
+        section = soup.find("div", class_=RANKS_WIDGET)
+        if section:
+            for item in section.find_all("li"):
+                rank = self.text(item.find("strong"))
+                label = item.get_text(strip=True).replace(rank, "").strip()
+                ranks_data.append([handle, label, rank])
+        return badges_data, ratings_data, ranks_data
+
+    def parse_submissions(self, html, handle):
+        soup = BeautifulSoup(html or "", self.features, parse_only=self.rows_strainer)
+        submissions_data = []
+        for row in soup.find_all("tr"):
+            cols = row.find_all("td")
+            if len(cols) == 5:
+                time_val, problem, result, language = (col.text.strip() for col in cols[:4])
+                link_tag = cols[4].find("a")
+                solution_link = f"{BASE_URL}{link_tag['href']}" if link_tag and link_tag.has_attr("href") else "N/A"
+                submissions_data.append([handle, time_val, problem, result, language, solution_link])
+        return submissions_data
+
+PARSERS = {"lxml": LxmlProfileParser, "soup": SoupProfileParser}
+default_parser = None
+
+def get_parser(name=None):
+    """The named parser, or the shared default: lxml when installed, else BeautifulSoup."""
+    global default_parser
+    if name:
+        return PARSERS[name]()
+    if default_parser is None:
+        default_parser = LxmlProfileParser() if etree is not None else SoupProfileParser()
+        logging.info(f"Parsing profiles with the {default_parser.name} parser")
+    return default_parser
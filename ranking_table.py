@@ -0,0 +1,164 @@
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional; BeautifulSoup's html.parser is used without it
+    lxml = None
+
+# Reads the MUI DataTable on a contest ranking page (/rankings/<code>).
+#   page_snapshot(driver)              -> what the page shows, taken from the live DOM in one script call
+#   find_table(snapshot["table"])      -> the parsed table
+#   ProblemColumns.from_header(table)  -> problem label per column index, worked out once per contest
+#   extract_rows(table, problems)      -> one dict per ranked user
+# Cells are located by their data-colindex attribute: 0 rank, 1 username, 2 total score,
+# 3 last AC, then one column per problem.
+
+TABLE_CLASS = re.compile(r"MuiTable-root.*MUIDataTable-tableRoot")
+HEADER_ROW_CLASS = re.compile(r"MuiTableRow-root.*MuiTableRow-head")
+BODY_ROW_CLASS = re.compile(r"MuiTableRow-root.*MUIDataTableBodyRow-root")
+BODY_ROW_SELECTOR = "tr[class*='MUIDataTableBodyRow-root']"  # the same rows, as a CSS selector for the browser
+PROBLEM_LINK_CLASS = re.compile(r"_problems__link")
+PROBLEM_LABEL = re.compile(r"P\d+")
+USER_HREF = re.compile(r"/users/")
+EXPECTED_PROBLEMS = [f"P{i}" for i in range(1, 9)]  # always reported, even if the contest has fewer
+
+# Runs in the browser: the table's own markup and the few page-level facts the scraper
+# needs, instead of serializing and re-parsing the whole page_source.
+SNAPSHOT_SCRIPT = """
+const table = [...document.querySelectorAll("table")].find(t => /MuiTable-root.*MUIDataTable-tableRoot/.test(t.className));
+const text = (document.body ? document.body.textContent : "").toLowerCase();
+const buttons = [...document.querySelectorAll("button")];
+const next = buttons.find(b => /Go to next page/i.test(b.getAttribute("aria-label") || ""))
+          || buttons.find(b => /Next/i.test(b.textContent))
+          || buttons.find(b => /MuiPaginationItem.*next/.test(b.className));
+return {
+  table: table ? table.outerHTML : null,
+  title: document.title,
+  no_results: ["no results", "no users", "0 results"].some(s => text.includes(s)),
+  has_next: !!next && !next.disabled && !next.classList.contains("disabled") && next.getAttribute("aria-disabled") !== "true",
+};
+"""
+
+def class_attr(element):
+    value = element.get("class") or ""
+    return " ".join(value) if isinstance(value, list) else value
+
+def parse_fragment(html):
+    """Parse table markup with lxml when installed, else html.parser; both are walked the same way below."""
+    if lxml is not None:
+        return lxml.html.fragment_fromstring(html, create_parent="div")
+    return BeautifulSoup(html, "html.parser")
+
+def is_soup(element):
+    return hasattr(element, "find_all")
+
+def descendants(element, tag):
+    if is_soup(element):
+        return element.find_all(tag)
+    return (e for e in element.iter(tag) if e is not element)
+
+def first(element, tag, predicate=None):
+    return next((e for e in descendants(element, tag) if predicate is None or predicate(e)), None)
+
+def text(element, default=None):
+    """bs4's get_text(strip=True), or `default` when there is no element."""
+    if element is None:
+        return default
+    if is_soup(element):
+        return element.get_text(strip=True)
+    return "".join(s.strip() for s in element.itertext())
+
+def first_child(element, tag):
+    if is_soup(element):
+        return element.find(tag, recursive=False)
+    return next(element.iterchildren(tag), None)
+
+def page_snapshot(driver):
+    """Table markup plus no-results / next-page flags, read straight from the live DOM."""
+    return driver.execute_script(SNAPSHOT_SCRIPT)
+
+def snapshot_from_source(page_source):
+    """page_snapshot for saved pages (and drivers without execute_script)."""
+    soup = BeautifulSoup(page_source, "html.parser")
+    page_text = soup.get_text().lower()
+    table = soup.find("table", class_=TABLE_CLASS)
+    next_button = soup.find("button", {"aria-label": re.compile(r"Go to next page", re.I)}) or \
+                  soup.find("button", string=re.compile(r"Next", re.I)) or \
+                  soup.find("button", class_=re.compile(r"MuiPaginationItem.*next"))
+    return {
+        "table": str(table) if table else None,
+        "title": soup.title.get_text() if soup.title else None,
+        "no_results": any(s in page_text for s in ("no results", "no users", "0 results")),
+        "has_next": bool(next_button) and not ("disabled" in next_button.get("class", []) or next_button.has_attr("disabled")
+                                                or "true" in next_button.get("aria-disabled", "")),
+    }
+
+def find_table(html):
+    """The ranking table element inside `html` (a snapshot's table markup or a whole page), or None."""
+    return first(parse_fragment(html), "table", lambda e: TABLE_CLASS.search(class_attr(e)))
+
+class ProblemColumns:
+    """Problem label -> column index (None when the contest lacks that problem), built once per contest."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.present = [(label, index) for label, index in columns if index is not None]
+        self.names = [label for label, _ in columns]
+
+    @classmethod
+    def from_header(cls, table):
+        columns = []
+        header_row = first(table, "tr", lambda e: HEADER_ROW_CLASS.search(class_attr(e)))
+        if header_row is not None:
+            for index, header in enumerate(descendants(header_row, "th")):
+                label = text(first(header, "a", lambda e: PROBLEM_LINK_CLASS.search(class_attr(e))))
+                if label and PROBLEM_LABEL.match(label):
+                    columns.append((label, index))
+        existing = {label for label, _ in columns}
+        columns += [(label, None) for label in EXPECTED_PROBLEMS if label not in existing]
+        return cls(columns)
+
+def row_cells(row):
+    """data-colindex -> first cell with that index, in one pass over the row."""
+    cells = {}
+    for cell in descendants(row, "td"):
+        cells.setdefault(cell.get("data-colindex"), cell)
+    return cells
+
+def username_of(cell):
+    link = first(cell, "a", lambda e: USER_HREF.search(e.get("href") or ""))
+    if link is None:
+        return None
+    span = first(link, "span", lambda e: "m-username--link" in class_attr(e).split())
+    return text(span) if span is not None else link.get("title", "")
+
+def extract_rows(table, problems):
+    """One dict per body row with Username, Rank, Total Score, Last AC, P1..P8 and Problems Solved."""
+    rows = []
+    for row in descendants(table, "tr"):
+        if not BODY_ROW_CLASS.search(class_attr(row)):
+            continue
+        cells = row_cells(row)
+        username = username_of(cells["1"]) if "1" in cells else None
+        if not username:
+            continue
+        rank_cell, score_cell, last_ac_cell = cells.get("0"), cells.get("2"), cells.get("3")
+        user_data = {
+            "Username": username,
+            "Rank": text(first(rank_cell, "p"), "N/A") if rank_cell is not None else "N/A",
+            "Total Score": text(first_child(score_cell, "div"), "N/A") if score_cell is not None else "N/A",
+            "Last AC": text(first(last_ac_cell, "p"), "N/A") if last_ac_cell is not None else "N/A",
+        }
+        solved = 0
+        for label, index in problems.present:
+            cell = cells.get(str(index))
+            user_data[label] = text(first(cell, "a"), "-") if cell is not None else "-"
+            solved += user_data[label] != "-"
+        for label, index in problems.columns:
+            if index is None:
+                user_data[label] = "-"
+        user_data["Problems Solved"] = solved
+        rows.append(user_data)
+    return rows
@@ -0,0 +1,143 @@
+import logging
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CACHE_VERSION = 1
+
+class GroupIndex:
+    """Rows of each category (country or institute) pre-sorted by rating, stored CSR-style.
+
+    rows[offsets[c]:offsets[c + 1]] are the rows of category code c, highest rating first.
+    """
+
+    def __init__(self, codes, rating_order, n_categories):
+        grouped = rating_order[np.argsort(codes[rating_order], kind="stable")]
+        valid = codes[grouped] >= 0  # -1 = missing country/institute
+        self.rows = grouped[valid].astype(np.int32)
+        counts = np.bincount(codes[self.rows], minlength=n_categories)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+
+    def rows_for(self, code):
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+class RatingsIndex:
+    """Typed, indexed view of codechef.csv (global ratings) for fast lookups.
+
+    Country and Institute are dictionary-encoded, ranks and ratings are fixed-width
+    integers, and the indexes are:
+      - a hash map from lower-cased username to row
+      - rows sorted by rating (global and per country / institute) for top-K queries
+      - rows sorted by global rank for rank-range queries (binary search)
+    """
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.usernames = df["Username"].astype(str).to_numpy(dtype=object)
+        self.global_rank = df["Global Rank"].to_numpy(dtype=np.int32)
+        self.stars = df["Stars"].to_numpy(dtype=np.int8)
+        self.rating = df["Rating"].to_numpy(dtype=np.int32)
+        self.highest_rating = df["Highest Rating"].to_numpy(dtype=np.int32)
+        self.country_rank = df["Country Rank"].fillna(-1).to_numpy(dtype=np.int32)
+        self.fully_solved = df["Fully Solved"].to_numpy(dtype=np.int32)
+        self.partially_solved = df["Partially Solved"].to_numpy(dtype=np.int32)
+        self.last_contest = pd.to_datetime(df["Last Contest"], errors="coerce").to_numpy(dtype="datetime64[s]")
+
+        country = pd.Categorical(df["Country"])
+        institute = pd.Categorical(df["Institute"])
+        self.countries = list(country.categories)
+        self.institutes = list(institute.categories)
+        self.country_codes = country.codes.astype(np.int16)
+        self.institute_codes = institute.codes.astype(np.int32)
+        self.country_lookup = {name.lower(): i for i, name in enumerate(self.countries)}
+        self.institute_lookup = {name.lower(): i for i, name in enumerate(self.institutes)}
+
+        self.username_lookup = {name.lower(): i for i, name in enumerate(self.usernames)}
+        self.by_rating = np.lexsort((self.global_rank, -self.rating)).astype(np.int32)
+        self.by_rank = np.argsort(self.global_rank, kind="stable").astype(np.int32)
+        self.sorted_ranks = self.global_rank[self.by_rank]
+        self.by_country = GroupIndex(self.country_codes, self.by_rating, len(self.countries))
+        self.by_institute = GroupIndex(self.institute_codes, self.by_rating, len(self.institutes))
+
+    @classmethod
+    def from_csv(cls, csv_path="codechef.csv", cache_path=None):
+        """Build from the CSV, or load the pickled index if it was built from the same file."""
+        csv_path = Path(csv_path)
+        cache_path = Path(cache_path) if cache_path else csv_path.with_suffix(".index.pkl")
+        stat = csv_path.stat()
+        signature = (CACHE_VERSION, stat.st_size, stat.st_mtime_ns)
+        if cache_path.exists():
+            try:
+                with open(cache_path, "rb") as f:
+                    cached_signature, index = pickle.load(f)
+                if cached_signature == signature:
+                    return index
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable index cache {cache_path}: {e}")
+        index = cls(pd.read_csv(csv_path))
+        with open(cache_path, "wb") as f:
+            pickle.dump((signature, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        logging.info(f"Indexed {index.n} ratings from {csv_path} (cached to {cache_path})")
+        return index
+
+    def record(self, row):
+        country = self.country_codes[row]
+        institute = self.institute_codes[row]
+        return {
+            "Global Rank": int(self.global_rank[row]),
+            "Stars": int(self.stars[row]),
+            "Username": self.usernames[row],
+            "Country": self.countries[country] if country >= 0 else None,
+            "Country Rank": int(self.country_rank[row]) if self.country_rank[row] >= 0 else None,
+            "Rating": int(self.rating[row]),
+            "Highest Rating": int(self.highest_rating[row]),
+            "Fully Solved": int(self.fully_solved[row]),
+            "Partially Solved": int(self.partially_solved[row]),
+            "Last Contest": str(self.last_contest[row]).replace("T", " "),
+            "Institute": self.institutes[institute] if institute >= 0 else None,
+        }
+
+    def lookup(self, username):
+        row = self.username_lookup.get(username.lower())
+        return None if row is None else self.record(row)
+
+    def top_rows(self, k=10, country=None, institute=None):
+        """Row numbers of the k highest-rated users, optionally within one country/institute."""
+        if country is not None and institute is not None:
+            rows = self.top_rows(self.n, institute=institute)
+            code = self.country_lookup.get(country.lower(), -2)
+            return rows[self.country_codes[rows] == code][:k]
+        if country is not None:
+            code = self.country_lookup.get(country.lower())
+            return self.by_country.rows_for(code)[:k] if code is not None else self.by_rating[:0]
+        if institute is not None:
+            code = self.institute_lookup.get(institute.lower())
+            return self.by_institute.rows_for(code)[:k] if code is not None else self.by_rating[:0]
+        return self.by_rating[:k]
+
+    def top_by_rating(self, k=10, country=None, institute=None):
+        return [self.record(row) for row in self.top_rows(k, country, institute)]
+
+    def rank_range_rows(self, low, high):
+        """Row numbers with low <= Global Rank <= high, in rank order."""
+        start = np.searchsorted(self.sorted_ranks, low, side="left")
+        end = np.searchsorted(self.sorted_ranks, high, side="right")
+        return self.by_rank[start:end]
+
+    def rank_range(self, low, high):
+        return [self.record(row) for row in self.rank_range_rows(low, high)]
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    # Through the module, so the pickle refers to ratings_index.RatingsIndex, not __main__'s copy
+    from ratings_index import RatingsIndex as ImportedIndex
+
+    index = ImportedIndex.from_csv("codechef.csv")
+    print(f"✅ {index.n} users, {len(index.countries)} countries, {len(index.institutes)} institutes")
+    for user in index.top_by_rating(5, country="India"):
+        print(f"{user['Global Rank']:>6}  {user['Username']:<24}{user['Rating']:>6}  {user['Institute']}")
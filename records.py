@@ -0,0 +1,112 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# Column-wise buffers for the scraped profile rows, instead of one Python list per row.
+#   DictionaryColumn  repeating strings (handles, badge titles, results, languages) stored once;
+#                     each row keeps a 4-byte code in an array('i'), -1 for None
+#   RecordTable       one buffer per column; append()/extend() take the scraper's row lists,
+#                     iterating gives the rows back as lists (for the Excel writers), take()
+#                     reorders them
+#   to_frame()        pandas DataFrame, dictionary columns as Categorical
+#   to_arrow()        pyarrow Table, dictionary columns as DictionaryArray over the code buffer;
+#                     storage.write_table writes Parquet/Feather from it
+# Other columns (times, solution links, ratings) are mostly unique and stay plain lists of str.
+# A table cannot grow while an Arrow table made from it is alive: it shares the code buffers.
+
+class DictionaryColumn:
+    """Dictionary-encoded string column."""
+
+    __slots__ = ("codes", "index", "values")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.index = {}
+        self.values = []
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        values = self.values
+        return (values[code] if code >= 0 else None for code in self.codes)
+
+    def take(self, positions):
+        """New column with the rows at `positions` (a list of ints), sharing this dictionary's strings."""
+        column = DictionaryColumn()
+        column.index = dict(self.index)
+        column.values = list(self.values)
+        column.codes = array("i", self.code_array()[positions].tobytes())
+        return column
+
+    def code_array(self):
+        """The codes as int32 numpy array sharing the array('i') buffer."""
+        return np.frombuffer(self.codes, dtype=np.int32)
+
+    def to_pandas(self):
+        return pd.Categorical.from_codes(self.code_array(), pd.Index(self.values), validate=False)
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        codes = self.code_array()
+        indices = pa.array(codes, mask=codes < 0) if (codes < 0).any() else pa.array(codes)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.values, type=pa.string()))
+
+class RecordTable:
+    """Rows of one table held column by column; `dictionary` names the columns to encode."""
+
+    __slots__ = ("columns", "buffers")
+
+    def __init__(self, columns, dictionary=()):
+        self.columns = list(columns)
+        self.buffers = [DictionaryColumn() if column in dictionary else [] for column in self.columns]
+
+    def append(self, row):
+        if len(row) != len(self.buffers):
+            raise ValueError(f"Expected {len(self.buffers)} values ({self.columns}), got {len(row)}")
+        for buffer, value in zip(self.buffers, row):
+            buffer.append(value)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self.buffers[0])
+
+    def take(self, positions):
+        """New table with the rows at `positions` (a list of ints), in that order."""
+        table = RecordTable.__new__(RecordTable)
+        table.columns = list(self.columns)
+        table.buffers = [buffer.take(positions) if isinstance(buffer, DictionaryColumn) else [buffer[i] for i in positions]
+                         for buffer in self.buffers]
+        return table
+
+    def __iter__(self):
+        return map(list, zip(*self.buffers))
+
+    def to_frame(self):
+        return pd.DataFrame({
+            column: buffer.to_pandas() if isinstance(buffer, DictionaryColumn) else buffer
+            for column, buffer in zip(self.columns, self.buffers)
+        })
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.table({
+            column: buffer.to_arrow() if isinstance(buffer, DictionaryColumn) else pa.array(buffer, type=pa.string())
+            for column, buffer in zip(self.columns, self.buffers)
+        })
@@ -0,0 +1,177 @@
+import argparse
+import datetime
+import glob
+import json
+import logging
+import re
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, f1_score
+
+from features import build_features
+from predict import make_pipelines, model_features, min_problems_threshold
+from storage import read_table, write_table
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# ---------- CONFIG ----------
+contest_glob = "codechef_*_contest_data.*"
+feature_store_path = "feature_store.parquet"
+manifest_path = "feature_store_manifest.json"
+models_dir = "models"
+trees_per_update = 50  # trees added to each forest per retrain
+max_trees = 1000  # oldest trees are dropped beyond this
+# ----------------------------
+
+def contest_code_from_path(path):
+    m = re.search(r"codechef_(.+?)_contest_data", Path(path).name)
+    return m.group(1) if m else Path(path).stem
+
+def file_signature(path):
+    stat = Path(path).stat()
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+def load_manifest(path=manifest_path):
+    path = Path(path)
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+def find_new_contest_files(pattern=contest_glob, manifest=None):
+    """Contest exports that are not in the feature store yet (or changed since)."""
+    manifest = manifest if manifest is not None else load_manifest()
+    latest = {}
+    for path in sorted(glob.glob(pattern)):
+        # One contest may exist as .xlsx and .parquet; prefer the columnar file
+        code = contest_code_from_path(path)
+        if code not in latest or Path(path).suffix == ".parquet":
+            latest[code] = path
+    return [path for path in latest.values() if manifest.get(path) != file_signature(path)]
+
+def update_feature_store(paths, store_path=feature_store_path, manifest_file=manifest_path):
+    """Featurize only `paths` and append them to the store. Returns (store, new rows)."""
+    manifest = load_manifest(manifest_file)
+    store = read_table(store_path) if Path(store_path).exists() else pd.DataFrame()
+    frames = []
+    for path in paths:
+        code = contest_code_from_path(path)
+        df, _ = build_features(read_table(path))
+        df.insert(0, "Contest", code)
+        frames.append(df[["Contest", "Username", "Rank_num", "Problems Solved"] + model_features])
+        manifest[path] = file_signature(path)
+        logging.info(f"Featurized {len(df)} rows from {path} ({code})")
+    if not frames:
+        return store, pd.DataFrame()
+
+    new_rows = pd.concat(frames, ignore_index=True)
+    if not store.empty:
+        store = store[~store["Contest"].isin(new_rows["Contest"])]
+    store = pd.concat([store, new_rows], ignore_index=True)
+    write_table(store, store_path)
+    Path(manifest_file).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    logging.info(f"Feature store now holds {len(store)} rows from {store['Contest'].nunique()} contests")
+    return store, new_rows
+
+def latest_version(directory=models_dir):
+    versions = sorted(Path(directory).glob("v*/metadata.json"))
+    if not versions:
+        return None, None
+    return versions[-1].parent, json.loads(versions[-1].read_text(encoding="utf-8"))
+
+def add_trees(pipeline, X, y, n_new):
+    """Grow the forest by `n_new` trees fitted on (X, y) only, keeping the fitted scaler."""
+    rf = pipeline.named_steps["rf"]
+    rf.set_params(warm_start=True, n_estimators=len(rf.estimators_) + n_new)
+    rf.fit(pipeline.named_steps["scaler"].transform(X), y)
+    if len(rf.estimators_) > max_trees:
+        rf.estimators_ = rf.estimators_[-max_trees:]
+        rf.set_params(n_estimators=max_trees)
+    return pipeline
+
+def split_xy(df):
+    X = df[model_features].to_numpy(dtype=float)
+    y_rank = df["Rank_num"].astype(float).to_numpy()
+    y_class = (df["Problems Solved"] >= min_problems_threshold).astype(int).to_numpy()
+    return X, y_rank, y_class
+
+def retrain(store, new_rows, directory=models_dir, n_new=trees_per_update):
+    """Update the latest model version with `new_rows`, or train v0001 from the whole store."""
+    parent_dir, parent_meta = latest_version(directory)
+    metrics = {}
+    # How each model was trained: "full" (fit on the whole store) or "warm_start" (trees added), and on how many rows
+    training = {}
+    if parent_dir is None:
+        reg, clf = make_pipelines()
+        X, y_rank, y_class = split_xy(store)
+        reg.fit(X, y_rank)
+        clf.fit(X, y_class)
+        training["regressor"] = training["classifier"] = ("full", len(store))
+        mode = "full"
+    else:
+        reg = joblib.load(parent_dir / "rank_regressor.joblib")
+        clf = joblib.load(parent_dir / "solved_classifier.joblib")
+        X, y_rank, y_class = split_xy(new_rows)
+        # How well the previous version predicted the unseen contest(s)
+        metrics["prev_mae_on_new"] = float(mean_absolute_error(y_rank, reg.predict(X)))
+        metrics["prev_f1_on_new"] = float(f1_score(y_class, clf.predict(X), zero_division=0))
+        add_trees(reg, X, y_rank, n_new)
+        training["regressor"] = ("warm_start", len(new_rows))
+        if set(np.unique(y_class)) == set(clf.named_steps["rf"].classes_):
+            add_trees(clf, X, y_class, n_new)
+            training["classifier"] = ("warm_start", len(new_rows))
+        else:
+            # New trees must see every class, otherwise their votes cannot be averaged
+            logging.info("New contest lacks a class seen before; refitting the classifier on the full store")
+            _, clf = make_pipelines()
+            X_all, _, y_class_all = split_xy(store)
+            clf.fit(X_all, y_class_all)
+            training["classifier"] = ("full", len(store))
+        mode = "incremental"
+
+    version = (parent_meta["version"] + 1) if parent_meta else 1
+    out_dir = Path(directory) / f"v{version:04d}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(reg, out_dir / "rank_regressor.joblib")
+    joblib.dump(clf, out_dir / "solved_classifier.joblib")
+    metadata = {
+        "version": version,
+        "parent": parent_meta["version"] if parent_meta else None,
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "mode": mode,
+        "contests": sorted(store["Contest"].unique().tolist()),
+        "new_contests": sorted(new_rows["Contest"].unique().tolist()) if not new_rows.empty else [],
+        "rows_total": int(len(store)),
+        "models": {
+            name: {"training": training[name][0], "rows_trained": int(training[name][1]),
+                   "trees": len(model.named_steps["rf"].estimators_)}
+            for name, model in (("regressor", reg), ("classifier", clf))
+        },
+        "features": model_features,
+        "min_problems_threshold": min_problems_threshold,
+        "metrics": metrics,
+    }
+    (out_dir / "metadata.json").write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+    # Keep the top-level files that inference.py and predict.py users load by default current
+    joblib.dump(reg, "rank_regressor.joblib")
+    joblib.dump(clf, "solved_classifier.joblib")
+    logging.info(f"Saved model version {version} ({mode}) to {out_dir}")
+    return out_dir, metadata
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Featurize new contest exports and update the models incrementally.")
+    parser.add_argument("--glob", default=contest_glob, help="contest export files to consider")
+    parser.add_argument("--trees", type=int, default=trees_per_update, help="trees added per forest")
+    args = parser.parse_args()
+
+    new_files = find_new_contest_files(args.glob)
+    if not new_files:
+        print("No new contest files; models are up to date")
+    else:
+        store, new_rows = update_feature_store(new_files)
+        out_dir, metadata = retrain(store, new_rows, n_new=args.trees)
+        trained = ", ".join(f"{name} {m['training']} on {m['rows_trained']} rows" for name, m in metadata["models"].items())
+        print(f"✅ Model v{metadata['version']} ({metadata['mode']}: {trained}) "
+              f"from {', '.join(metadata['new_contests'])}; saved to {out_dir}")
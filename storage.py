@@ -0,0 +1,168 @@
+import logging
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+from records import RecordTable
+
+# Column layout of the profile tables; Excel sheet names match the table names so the
+# dashboards and Power BI report keep working with the exported workbook.
+PROFILE_COLUMNS = {
+    "Users": ["Username"],
+    "Badges": ["Username", "Title", "Description", "Image URL"],
+    "Ratings": ["Username", "Rating", "Stars", "Highest"],
+    "Ranks": ["Username", "Label", "Rank"],
+    "Submissions": ["Username", "Time", "Problem", "Result", "Language", "Solution Link"],
+}
+
+# Columns whose few distinct values repeat on every row; dictionary-encoded by profile_records()
+DICTIONARY_COLUMNS = {
+    "Badges": ["Username", "Title", "Description", "Image URL"],
+    "Ratings": ["Username", "Stars"],
+    "Ranks": ["Username", "Label"],
+    "Submissions": ["Username", "Problem", "Result", "Language"],
+}
+
+FORMAT_SUFFIXES = {"parquet": ".parquet", "feather": ".feather"}
+
+def profile_records():
+    """Empty RecordTables for the scraped tables (Badges, Ratings, Ranks, Submissions)."""
+    return {name: RecordTable(PROFILE_COLUMNS[name], columns) for name, columns in DICTIONARY_COLUMNS.items()}
+
+def profile_tables(users, badges_all, ratings_all, ranks_all, submissions_all, keep_records=False):
+    """Turn the scraper's row lists (or RecordTables) into one DataFrame per profile table.
+
+    With `keep_records`, RecordTables are returned as they are, for write_tables to write
+    through Arrow without building a DataFrame.
+    """
+    rows = {
+        "Users": [[u] for u in users],
+        "Badges": badges_all,
+        "Ratings": ratings_all,
+        "Ranks": ranks_all,
+        "Submissions": submissions_all,
+    }
+    tables = {}
+    for name, columns in PROFILE_COLUMNS.items():
+        if isinstance(rows[name], RecordTable):
+            tables[name] = rows[name] if keep_records else rows[name].to_frame()
+        else:
+            tables[name] = pd.DataFrame(rows[name], columns=columns)
+    return tables
+
+def write_table(df, path):
+    """Write a DataFrame, or a RecordTable (Parquet and Feather straight from its Arrow table)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+    if isinstance(df, RecordTable):
+        if suffix == ".parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(df.to_arrow(), path)
+            return path
+        if suffix in (".feather", ".arrow"):
+            import pyarrow.feather as feather
+            feather.write_feather(df.to_arrow(), path)
+            return path
+        df = df.to_frame()
+    if suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    elif suffix in (".feather", ".arrow"):
+        df.reset_index(drop=True).to_feather(path)
+    elif suffix == ".csv":
+        df.to_csv(path, index=False)
+    elif suffix in (".xlsx", ".xls"):
+        df.to_excel(path, index=False, engine="openpyxl")
+    else:
+        raise ValueError(f"Unsupported table format: {path}")
+    return path
+
+def read_table(path, columns=None, sheet_name=0):
+    """Read one table from .parquet/.feather/.csv/.xlsx, chosen by file suffix."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    if suffix in (".feather", ".arrow"):
+        return pd.read_feather(path, columns=columns)
+    if suffix == ".csv":
+        return pd.read_csv(path, usecols=columns)
+    if suffix in (".xlsx", ".xls"):
+        return pd.read_excel(path, sheet_name=sheet_name, usecols=columns, engine="openpyxl")
+    raise ValueError(f"Unsupported table format: {path}")
+
+def write_tables(tables, directory, fmt="parquet"):
+    """Write each table to <directory>/<name>.<fmt>. Returns the written paths."""
+    directory = Path(directory)
+    paths = {name: write_table(df, directory / f"{name}{FORMAT_SUFFIXES[fmt]}") for name, df in tables.items()}
+    logging.info(f"Saved {len(tables)} tables to {directory} as {fmt}")
+    return paths
+
+def read_tables(directory, names=None, fmt="parquet"):
+    directory = Path(directory)
+    names = names or list(PROFILE_COLUMNS)
+    return {name: read_table(directory / f"{name}{FORMAT_SUFFIXES[fmt]}") for name in names}
+
+def export_excel(tables, file_path):
+    """Optional sink: all tables in one workbook, one sheet per table."""
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        for name, df in tables.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    logging.info(f"Exported {len(tables)} sheets to {file_path}")
+    return file_path
+
+class StreamingExcelWriter:
+    """Write-only openpyxl workbook that rows can be appended to in any order.
+
+    Each sheet is backed by its own temporary file and rows are flushed as they arrive,
+    so memory stays flat no matter how many submissions are exported. Call close() (or
+    use it as a context manager) to assemble the .xlsx.
+    """
+
+    def __init__(self, file_path, columns=PROFILE_COLUMNS):
+        self.file_path = Path(file_path)
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheets = {}
+        self.counts = {}
+        for name, header in columns.items():
+            sheet = self.workbook.create_sheet(name)
+            sheet.append(header)
+            self.sheets[name] = sheet
+            self.counts[name] = 0
+
+    def append(self, sheet, row):
+        self.sheets[sheet].append(row)
+        self.counts[sheet] += 1
+
+    def extend(self, sheet, rows):
+        target = self.sheets[sheet]
+        n = 0
+        for row in rows:
+            target.append(row)
+            n += 1
+        self.counts[sheet] += n
+
+    def close(self):
+        if self.workbook is None:
+            return self.file_path
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.workbook.save(self.file_path)
+        self.workbook = None
+        logging.info(f"Streamed {sum(self.counts.values())} rows into {self.file_path} ({self.counts})")
+        return self.file_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def stream_to_excel(sheets, file_path, columns=PROFILE_COLUMNS):
+    """Consume {sheet name: iterable of rows} (lists or generators) into a workbook."""
+    with StreamingExcelWriter(file_path, {name: columns[name] for name in sheets}) as writer:
+        for name, rows in sheets.items():
+            writer.extend(name, rows)
+    return Path(file_path)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Local stand-in for www.codechef.com that replays canned pages from FIXTURES_DIR.
+#   /users/<handle>                      -> profiles/<handle>.html  (else profiles/default.html)
+#   /recent/user?user_handle=<h>&page=N  -> recent/<h>/page<N>.json, recent/<h>.json (else recent/default.json)
+#   /api/ratings/all?page=N              -> ratings/page<N>.json    (recorded JSON listing)
+#   /ratings/all?page=N                  -> the same page rendered as the MUI table Selenium sees
+#   /rankings/<contest>?page=N           -> rankings/<contest>/page<N>.json rendered as the contest table
+# "{{handle}}" inside a fallback fixture is replaced by the requested handle, so any
+# number of synthetic users can be served from one template. With `failures`, the first
+# that many requests for each URL get a 503 with Retry-After: 1, to exercise retries.
+
+def render_fixture(folder, name, suffix, handle):
+    path = folder / f"{name}{suffix}"
+    if not path.exists():
+        path = folder / f"default{suffix}"
+        if not path.exists():
+            return None
+    return path.read_text(encoding="utf-8").replace("{{handle}}", handle)
+
+def load_ratings_page(fixtures_dir, page):
+    path = Path(fixtures_dir) / "ratings" / f"page{page}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def render_ratings_html(payload):
+    rows = "".join(
+        f'<tr class="MuiTableRow-root MUIDataTableBodyRow-root">'
+        f'<td data-colindex="0"><a href="/users/{u["username"]}" title="{u["username"]}">'
+        f'<span class="m-username--link">{u["username"]}</span></a></td>'
+        f'<td data-colindex="1">{u["global_rank"]}</td><td data-colindex="2">{u["rating"]}</td></tr>'
+        for u in payload["list"]
+    )
+    last = payload["currentPage"] >= payload["availablePages"]
+    next_button = f'<button aria-label="Go to next page" class="MuiPaginationItem-root MuiPaginationItem-next"{" disabled" if last else ""}>Next</button>'
+    return (
+        "<html><head><title>CodeChef Ratings</title></head><body>"
+        '<table class="MuiTable-root MUIDataTable-tableRoot"><thead><tr><th>Username</th><th>Rank</th><th>Rating</th></tr></thead>'
+        f"<tbody>{rows}</tbody></table><nav>{next_button}</nav></body></html>"
+    )
+
+def render_rankings_html(payload):
+    """A contest ranking page (/rankings/<code>) as the MUI DataTable the Selenium scraper reads."""
+    problems = payload["problems"]
+    headers = "".join(
+        f'<th data-colindex="{4 + i}"><a class="_problems__link_x1" href="/problems/{code}">{label}</a></th>'
+        for i, (label, code) in enumerate(problems)
+    )
+    rows = []
+    for u in payload["list"]:
+        cells = "".join(
+            f'<td data-colindex="{4 + i}"><div><a href="/viewsolution/{u["username"]}-{code}">{u["scores"][i]}</a></div></td>'
+            if u["scores"][i] != "-" else f'<td data-colindex="{4 + i}"><div>-</div></td>'
+            for i, (_, code) in enumerate(problems)
+        )
+        rows.append(
+            f'<tr class="MuiTableRow-root MUIDataTableBodyRow-root">'
+            f'<td data-colindex="0"><div class="tbl-label">Rank</div><p>{u["rank"]}</p></td>'
+            f'<td data-colindex="1"><a href="/users/{u["username"]}" title="{u["username"]}">'
+            f'<span class="m-username--link">{u["username"]}</span></a></td>'
+            f'<td data-colindex="2"><div>Total Score</div><div>{u["total_score"]}</div></td>'
+            f'<td data-colindex="3"><div class="tbl-label">Last AC</div><p>{u["last_ac"]}</p></td>{cells}</tr>'
+        )
+    last = payload["currentPage"] >= payload["availablePages"]
+    next_button = f'<button aria-label="Go to next page" class="MuiPaginationItem-root MuiPaginationItem-next"{" disabled" if last else ""}>Next</button>'
+    return (
+        f"<html><head><title>{payload['contest']} | CodeChef</title></head><body>"
+        '<table class="MuiTable-root MUIDataTable-tableRoot"><thead><tr class="MuiTableRow-root MuiTableRow-head">'
+        f'<th data-colindex="0">Rank</th><th data-colindex="1">Username</th><th data-colindex="2">Total Score</th>'
+        f'<th data-colindex="3">Last AC</th>{headers}</tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table><nav>{next_button}</nav></body></html>"
+    )
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+    fixtures_dir = FIXTURES_DIR
+    delay = 0.0
+    failures = 0
+    attempts = None  # URL -> requests seen, shared by all handler instances of one server
+    lock = None
+
+    def log_message(self, format, *args):
+        logging.debug("stub: " + format % args)
+
+    def send_body(self, status, body, content_type):
+        data = body.encode("utf-8")
+        etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.failures:
+            with self.lock:
+                self.attempts[self.path] = seen = self.attempts.get(self.path, 0) + 1
+            if seen <= self.failures:
+                self.send_response(503)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        parsed = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        parts = [p for p in parsed.path.split("/") if p]
+
+        if len(parts) == 2 and parts[0] == "users":
+            handle = urllib.parse.unquote(parts[1])
+            body = render_fixture(self.fixtures_dir / "profiles", handle, ".html", handle)
+            if body is not None:
+                return self.send_body(200, body, "text/html; charset=utf-8")
+        elif parts == ["recent", "user"]:
+            handle = query.get("user_handle", [""])[0]
+            page = int(query.get("page", ["0"])[0])
+            body = None
+            paged = self.fixtures_dir / "recent" / handle / f"page{page}.json"
+            if paged.exists():
+                body = paged.read_text(encoding="utf-8")
+            elif not (self.fixtures_dir / "recent" / handle).is_dir():
+                body = render_fixture(self.fixtures_dir / "recent", handle, ".json", handle)
+            if body is not None:
+                return self.send_body(200, body, "application/json")
+        elif parts in (["api", "ratings", "all"], ["ratings", "all"]):
+            payload = load_ratings_page(self.fixtures_dir, int(query.get("page", ["1"])[0]))
+            if parts[0] == "api":
+                if payload is None:
+                    payload = {"list": [], "availablePages": 0}
+                return self.send_body(200, json.dumps(payload), "application/json")
+            if payload is None:
+                return self.send_body(200, "<html><body><p>No results</p></body></html>", "text/html; charset=utf-8")
+            return self.send_body(200, render_ratings_html(payload), "text/html; charset=utf-8")
+
+        elif len(parts) == 2 and parts[0] == "rankings":
+            path = self.fixtures_dir / "rankings" / parts[1] / f"page{int(query.get('page', ['1'])[0])}.json"
+            if not path.exists():
+                return self.send_body(200, "<html><body><p>No results</p></body></html>", "text/html; charset=utf-8")
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            return self.send_body(200, render_rankings_html(payload), "text/html; charset=utf-8")
+
+        self.send_body(404, json.dumps({"status": "error", "message": "not found"}), "application/json")
+
+def start_stub_server(fixtures_dir=FIXTURES_DIR, host="127.0.0.1", port=0, delay=0.0, failures=0):
+    """Serve fixtures on a background thread. Returns (server, base_url); call server.shutdown() when done."""
+    handler = type("BoundStubHandler", (StubHandler,), {"fixtures_dir": Path(fixtures_dir), "delay": delay,
+                                                        "failures": failures, "attempts": {}, "lock": threading.Lock()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    logging.info(f"Stub CodeChef server listening on {base_url} (fixtures: {fixtures_dir})")
+    return server, base_url
+
+# ------------------ MAIN ------------------ #
+if __name__ == "__main__":
+    server, base_url = start_stub_server(port=8765)
+    print(f"✅ Serving fixtures at {base_url} - press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,104 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests.exceptions
+
+from http_client import create_session
+from instrumentation import add_time, stage
+from profile_parser import get_parser
+
+BASE_URL = "https://www.codechef.com"
+
+# The recent-submissions API (/recent/user?user_handle=<h>&page=N) returns 0-based pages,
+# newest first, each with the HTML table in "content" and the number of pages in
+# "max_page". Submission rows are identified by their solution link (last column).
+
+class SubmissionCrawler:
+    """Fetches a user's whole submission history, page 0 first and the rest `workers` at a time.
+
+    Pages are requested in waves of `workers`; the crawl stops after the first wave that
+    reaches a submission already in `known` (the history stored by a previous run), so an
+    incremental refresh costs one or two requests per user. Share one crawler, and the
+    HostRateLimiter passed to it, between all users of a run. Failed requests are retried
+    by the session; without one, a create_session(workers, max_retries) session is used.
+    """
+
+    def __init__(self, session=None, headers=None, limiter=None, base_url=BASE_URL, workers=4,
+                 max_retries=3, max_pages=None, parser=None, timeout=10):
+        self.session = session or create_session(workers, max_retries)
+        self.headers = headers or {}
+        self.limiter = limiter
+        self.base_url = base_url
+        self.workers = workers
+        self.max_pages = max_pages
+        self.parser = parser or get_parser()
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def page_url(self, handle, page):
+        return f"{self.base_url}/recent/user?user_handle={handle}&page={page}"
+
+    def fetch_page(self, handle, page):
+        """Returns (rows, max_page) or None if the page could not be fetched."""
+        url = self.page_url(handle, page)
+        if self.limiter:
+            add_time("rate_limit_wait", self.limiter.acquire(url))
+        try:
+            with stage("fetch"):
+                resp = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            if resp.status_code == 200:
+                with stage("parse"):
+                    data = resp.json()
+                    return self.parser.parse_submissions(data.get("content", ""), handle), int(data.get("max_page") or 1)
+            logging.error(f"Request failed for submissions {handle} page {page}, skipping: Status {resp.status_code}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.error(f"Request failed for submissions {handle} page {page}, skipping: {e}")
+        return None
+
+    def crawl(self, handle, known=None):
+        """Full history of `handle`, newest first: newly fetched rows followed by `known` rows.
+
+        `known` is the stored submission rows from an earlier crawl (or None). Returns None
+        if any page up to the known rows could not be fetched: storing a history with a gap
+        would make later incremental runs stop before the missing submissions.
+        """
+        known = known or []
+        known_links = {row[5] for row in known} - {"N/A"}
+        first = self.fetch_page(handle, 0)
+        if first is None:
+            return None
+        rows, max_page = first
+        if self.max_pages:
+            max_page = min(max_page, self.max_pages)
+        pages = [rows]
+        reached_known = any(row[5] in known_links for row in rows)
+
+        while len(pages) < max_page and not reached_known:
+            wave = range(len(pages), min(len(pages) + self.workers, max_page))
+            for result in self.pool.map(lambda p: self.fetch_page(handle, p), wave):
+                if result is None:
+                    logging.warning(f"Submission history of {handle} is incomplete; keeping the stored history")
+                    return None
+                pages.append(result[0])
+                if any(row[5] in known_links for row in result[0]):
+                    reached_known = True
+                    break
+
+        history, seen = [], set()
+        for row in (row for page_rows in pages for row in page_rows):
+            link = row[5]
+            if link != "N/A" and (link in seen or link in known_links):
+                continue
+            seen.add(link)
+            history.append(row)
+        logging.info(f"Fetched {len(pages)} of {max_page} submission page(s) for {handle}: {len(history)} new submissions")
+        return history + known
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,101 @@
+import re
+import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# "Last AC" cells come in three shapes:
+#   contest exports   "1:07:45"      elapsed H:MM:SS since the contest started
+#   profile pages     "3 days ago"   relative to the time of scraping
+#   older dumps       "2024-11-12"   absolute dates in a handful of formats
+# All of them are converted to (fractional) days; missing or unparseable cells become -1.
+
+MISSING_VALUES = {"", "-", "N/A", "NA", "nan", "NaN", "None", "NaT"}
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%b %d, %Y", "%d %b %Y")
+DURATION_PATTERN = r"^\s*(?:(\d+):)?(\d{1,2}):(\d{2})\s*$"
+RELATIVE_PATTERN = r"(\d+)\s*(sec|min|hour|hr|day|week|month|year)"
+DATE_LIKE = re.compile(r"\d{1,4}[-/ ]\w{1,3}[-/ ,]+\d{2,4}|\w{3} \d{1,2}, \d{4}")
+UNIT_DAYS = {
+    "sec": 1 / 86400, "min": 1 / 1440, "hour": 1 / 24, "hr": 1 / 24,
+    "day": 1, "week": 7, "month": 30, "year": 365,
+}
+
+DURATION_RE = re.compile(DURATION_PATTERN)
+RELATIVE_RE = re.compile(RELATIVE_PATTERN, re.I)
+
+@lru_cache(maxsize=65536)
+def classify(text):
+    """Parse one distinct string. Returns (kind, value): ("days", float), ("date:<fmt>", datetime) or ("missing", None)."""
+    text = text.strip()
+    if text in MISSING_VALUES:
+        return "missing", None
+    m = DURATION_RE.match(text)
+    if m:
+        hours, minutes, seconds = (int(g) if g else 0 for g in m.groups())
+        return "days", (hours * 3600 + minutes * 60 + seconds) / 86400
+    m = RELATIVE_RE.search(text)
+    if m:
+        return "days", int(m.group(1)) * UNIT_DAYS[m.group(2).lower()]
+    # strptime is only attempted on strings that look like a date at all
+    if DATE_LIKE.search(text):
+        for fmt in DATE_FORMATS:
+            try:
+                return f"date:{fmt}", datetime.datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+    return "missing", None
+
+def to_days(kind, value, now):
+    if kind == "days":
+        return value
+    if kind.startswith("date:"):
+        return float((now - value).days)
+    return -1.0
+
+def parse_last_ac(value, now=None):
+    """Scalar form of parse_last_ac_column, memoized on the string value."""
+    if pd.isnull(value):
+        return -1.0
+    return to_days(*classify(str(value)), now or datetime.datetime.now())
+
+def detect_format(uniques, sample_size=50):
+    """Pick the dominant kind ("duration", "relative", "date:<fmt>" or None) from a sample of distinct values."""
+    counts = {}
+    for text in uniques[:sample_size]:
+        kind, _ = classify(text)
+        if kind == "missing":
+            continue
+        if kind == "days":
+            kind = "duration" if DURATION_RE.match(text) else "relative"
+        counts[kind] = counts.get(kind, 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+def parse_last_ac_column(series, now=None):
+    """Convert a whole "Last AC" column to days in one pass.
+
+    The column is factorized so every distinct string is handled once, the format is
+    detected from a sample of those strings and parsed with a single vectorized
+    operation; anything that does not fit the detected format falls back to the
+    memoized scalar parser.
+    """
+    now = now or datetime.datetime.now()
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    text = pd.Series(uniques.astype(object), dtype=object).astype(str).str.strip()
+    days = np.full(len(text), np.nan)
+
+    fmt = detect_format(list(text))
+    if fmt == "duration":
+        parts = text.str.extract(DURATION_PATTERN).apply(pd.to_numeric, errors="coerce")
+        days = ((parts[0].fillna(0) * 3600 + parts[1] * 60 + parts[2]) / 86400).to_numpy(dtype=float, copy=True)
+    elif fmt == "relative":
+        parts = text.str.extract(RELATIVE_PATTERN, flags=re.I)
+        units = parts[1].str.lower().map(UNIT_DAYS)
+        days = (pd.to_numeric(parts[0], errors="coerce") * units).to_numpy(dtype=float, copy=True)
+    elif fmt is not None:
+        dates = pd.to_datetime(text, format=fmt[len("date:"):], errors="coerce")
+        days = (pd.Timestamp(now) - dates).dt.days.to_numpy(dtype=float, copy=True)
+
+    leftover = np.isnan(days)
+    days[leftover] = [to_days(*classify(t), now) for t in text[leftover]]
+    return pd.Series(np.append(days, -1.0)[codes], index=series.index)
@@ -0,0 +1,190 @@
+import logging
+import random
+import threading
+import time
+
+# Readiness waits for Selenium page loads, instead of fixed sleeps.
+#   install_watch(driver)          page hook: a MutationObserver stamping the last DOM change and
+#                                  a counter of fetch/XHR requests in flight
+#   wait_until_settled(driver, rows_selector)
+#                                  until the page has loaded, no loading icon is shown, no request
+#                                  is in flight, the row count has stopped changing and the DOM
+#                                  has been quiet for quiet_ms; returns the final page state.
+#                                  The request and quiet checks are best-effort: pages that poll
+#                                  in the background or animate never pass them, so after
+#                                  strict_polls polls a loaded page with stable rows and no
+#                                  loading icon is accepted without them
+#   wait_for_attribute(driver, element, name, text)
+#                                  until an attribute contains `text`, woken by a MutationObserver
+#   AdaptiveDelay                  pause between pages that follows the server's response times
+# wait_until_settled raises selenium's TimeoutException like WebDriverWait, so retry loops keep working.
+
+# Installed before any page script where the driver supports CDP, so requests made while the
+# page boots are counted too; otherwise after the load (and then only later requests are seen).
+WATCH_SCRIPT = """
+if (!window.__scrapeWatch) {
+  const watch = window.__scrapeWatch = {lastMutation: performance.now(), pending: 0};
+  const touch = () => { watch.lastMutation = performance.now(); };
+  const start = () => {
+    new MutationObserver(touch).observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+  };
+  if (document.documentElement) { start(); } else { document.addEventListener("DOMContentLoaded", start); }
+  if (window.fetch) {
+    const fetch = window.fetch;
+    window.fetch = function () {
+      watch.pending++;
+      return fetch.apply(this, arguments).finally(() => { watch.pending--; touch(); });
+    };
+  }
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    watch.pending++;
+    this.addEventListener("loadend", () => { watch.pending--; touch(); });
+    return send.apply(this, arguments);
+  };
+}
+"""
+
+# server_ms: time to first byte of the newest fetch/XHR, else of the document itself
+STATE_SCRIPT = """
+const watch = window.__scrapeWatch;
+const ttfb = e => e.responseStart > 0 ? e.responseStart - e.requestStart : e.duration;
+const calls = performance.getEntriesByType("resource").filter(e => e.initiatorType === "fetch" || e.initiatorType === "xmlhttprequest");
+const nav = performance.getEntriesByType("navigation")[0];
+const latest = calls.length ? calls[calls.length - 1] : nav;
+return {
+  ready: document.readyState,
+  rows: document.querySelectorAll(arguments[0]).length,
+  loading: !!document.querySelector(arguments[1]),
+  pending: watch ? watch.pending : 0,
+  quiet_ms: watch ? performance.now() - watch.lastMutation : null,
+  server_ms: latest ? ttfb(latest) : null,
+};
+"""
+
+# execute_async_script: resolves with true once the attribute contains the text, false on timeout
+ATTRIBUTE_SCRIPT = """
+const [element, name, text, timeoutMs, done] = arguments;
+const matches = () => (element.getAttribute(name) || "").includes(text);
+if (matches()) { done(true); return; }
+const observer = new MutationObserver(() => { if (matches()) { observer.disconnect(); done(true); } });
+observer.observe(element, {attributes: true, attributeFilter: [name]});
+setTimeout(() => { observer.disconnect(); done(matches()); }, timeoutMs);
+"""
+
+LOADING_SELECTOR = ".loadingIcon"
+
+def install_watch(driver):
+    """Install WATCH_SCRIPT for every later document (via CDP when available) and the current one."""
+    if not getattr(driver, "_scrape_watch_installed", False):
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": WATCH_SCRIPT})
+        except Exception as e:  # not Chrome, or a remote driver without CDP
+            logging.debug(f"CDP unavailable, installing the page watch after each load: {e}")
+        driver._scrape_watch_installed = True
+    driver.execute_script(WATCH_SCRIPT)
+
+class PageSettled:
+    """WebDriverWait condition: loaded, no loading icon, no request in flight, rows stable, DOM quiet.
+
+    The row count has to read the same on `stable_polls` consecutive polls; a page with
+    no rows at all (an empty listing) settles the same way. From poll `strict_polls` on,
+    requests in flight and DOM changes are ignored; the returned state then has
+    "relaxed": True.
+    """
+
+    def __init__(self, rows_selector, loading_selector=LOADING_SELECTOR, quiet_ms=300, stable_polls=2,
+                 strict_polls=30):
+        self.rows_selector = rows_selector
+        self.loading_selector = loading_selector
+        self.quiet_ms = quiet_ms
+        self.stable_polls = stable_polls
+        self.strict_polls = strict_polls
+        self.last_rows = None
+        self.stable = 0
+        self.polls = 0
+
+    def __call__(self, driver):
+        state = driver.execute_script(STATE_SCRIPT, self.rows_selector, self.loading_selector)
+        self.polls += 1
+        self.stable = self.stable + 1 if state["rows"] == self.last_rows else 0
+        self.last_rows = state["rows"]
+        if state["ready"] != "complete" or state["loading"] or self.stable + 1 < self.stable_polls:
+            return False
+        quiet = state["quiet_ms"] is None or state["quiet_ms"] >= self.quiet_ms
+        if not state["pending"] and quiet:
+            return state
+        if self.polls >= self.strict_polls:
+            return dict(state, relaxed=True)
+        return False
+
+def wait_until_settled(driver, rows_selector, timeout=30, poll=0.1, quiet_ms=300, strict_polls=30):
+    """The page state once PageSettled holds; raises TimeoutException after `timeout` seconds."""
+    from selenium.webdriver.support.ui import WebDriverWait  # selenium stays optional for AdaptiveDelay users
+
+    install_watch(driver)
+    state = WebDriverWait(driver, timeout, poll_frequency=poll).until(
+        PageSettled(rows_selector, quiet_ms=quiet_ms, strict_polls=strict_polls))
+    if state.get("relaxed"):
+        logging.debug(f"Page settled without network/DOM quiet ({state['pending']} requests in flight, "
+                      f"quiet {state['quiet_ms']} ms); rows stable at {state['rows']}")
+    return state
+
+def wait_for_attribute(driver, element, name, text, timeout=120):
+    """True once element's `name` attribute contains `text`, False when `timeout` passes first.
+
+    The driver's script timeout is raised for the call and restored afterwards, since
+    pooled drivers are shared with other callers.
+    """
+    previous = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        return bool(driver.execute_async_script(ATTRIBUTE_SCRIPT, element, name, text, int(timeout * 1000)))
+    finally:
+        driver.set_script_timeout(previous)
+
+class AdaptiveDelay:
+    """Pause between page loads derived from an EWMA of the server's response times.
+
+    The pause is `factor` times the smoothed response time, kept within
+    [min_delay, max_delay], with +-`jitter` spread. A response slower than `slow_factor`
+    times the average, or one the caller reports as throttled (a retry, a 429 page),
+    doubles a penalty multiplier; each normal response shrinks it back towards 1.
+    """
+
+    def __init__(self, min_delay=0.5, max_delay=30.0, factor=1.5, alpha=0.3, jitter=0.2, slow_factor=3.0,
+                 initial=1.0):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.alpha = alpha
+        self.jitter = jitter
+        self.slow_factor = slow_factor
+        self.average = initial
+        self.penalty = 1.0
+        self.observed = 0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds, throttled=False):
+        with self.lock:
+            if seconds is not None:
+                slow = self.observed > 0 and seconds > self.slow_factor * self.average
+                self.average = seconds if self.observed == 0 else self.alpha * seconds + (1 - self.alpha) * self.average
+                self.observed += 1
+                throttled = throttled or slow
+            if throttled:
+                self.penalty = min(self.penalty * 2, self.max_delay / max(self.min_delay, 1e-3))
+            else:
+                self.penalty = max(1.0, self.penalty * 0.75)
+
+    def current(self):
+        with self.lock:
+            delay = max(self.min_delay, self.factor * self.average) * self.penalty
+        return min(self.max_delay, delay)
+
+    def wait(self):
+        """Sleep for the current delay; returns the seconds slept."""
+        delay = self.current() * random.uniform(1 - self.jitter, 1 + self.jitter)
+        delay = min(self.max_delay, max(self.min_delay, delay))
+        time.sleep(delay)
+        return delay